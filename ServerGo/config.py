@@ -62,6 +62,21 @@ class Config:
         # CORS settings
         self.ALLOWED_ORIGINS = self._get_list("ALLOWED_ORIGINS", default=["*"])
 
+        # Persistent cache of finished analyses, keyed by SGF and settings
+        self.ANALYSIS_CACHE = self._get_bool("ANALYSIS_CACHE", default=False)
+        self.ANALYSIS_CACHE_PATH = os.environ.get(
+            "ANALYSIS_CACHE_PATH", "analysis_cache.sqlite3"
+        )
+        self.ANALYSIS_CACHE_MAX_ENTRIES = self._get_int(
+            "ANALYSIS_CACHE_MAX_ENTRIES", default=10_000, min_val=1, max_val=1_000_000
+        )
+        self.ANALYSIS_CACHE_TTL_SEC = self._get_int(
+            "ANALYSIS_CACHE_TTL_SEC", default=604_800, min_val=60, max_val=31_536_000
+        )
+
+        # Board recognition: warp on the GPU when OpenCV is built with CUDA
+        self.USE_CUDA_WARP = self._get_bool("USE_CUDA_WARP", default=False)
+
         # Analysis limits
         self.MIN_ANALYSIS_STEPS = self._get_int(
             "MIN_ANALYSIS_STEPS", default=100, min_val=10, max_val=1000
@@ -1,10 +1,10 @@
-from typing import Tuple, Dict, Any, List, Optional
+from typing import Tuple, Dict, Any, List, Optional, Union
 from core.sgf.parser import SGF, Move, SGFNode
 
 
 def construct_katago_query(
     req_id: str,
-    sgf_content: str,
+    sgf_content: Union[str, bytes],
     visits: int,
     start_turn: Optional[int] = None,
     end_turn: Optional[int] = None,
@@ -7,7 +7,8 @@ import cv2
 import numpy as np
 import torch
 from torchvision import transforms
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Tuple
 import logging
 from ..config import RecognitionConfig
 
@@ -22,9 +23,10 @@ class StoneClassifier:
         self.device = device or torch.device("cpu")
         self.board_size = board_size
         self.transform = None
+        self._default_transform = None
 
         if model is not None:
-            self.transform = transforms.Compose(
+            self.transform = self._default_transform = transforms.Compose(
                 [
                     transforms.ToPILImage(),
                     transforms.Resize(RecognitionConfig.TARGET_SIZE),
@@ -36,6 +38,18 @@ class StoneClassifier:
                 ]
             )
 
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _grid_centers(width: int, margin: int, board_size: int) -> Tuple[int, ...]:
+        """
+        Pixel offsets of the grid lines for a warped board of this width.
+
+        Rows and columns share the spacing (it is derived from the width), and
+        warped boards come in a handful of fixed layouts, so compute them once.
+        """
+        cell_size = (width - 2 * margin) / (board_size - 1)
+        return tuple(int(margin + i * cell_size) for i in range(board_size))
+
     def classify(self, warped_image: np.ndarray, margin: int = 0) -> List[List[int]]:
         """
         Classify stones on warped board image.
@@ -74,28 +88,31 @@ class StoneClassifier:
     ) -> List[List[int]]:
         """CNN-based classification using ResNet9."""
         h, w = warped_image.shape[:2]
-        board_w = w - 2 * margin
-        cell_size = board_w / (self.board_size - 1)
 
-        patches = []
-        coords = []
+        if self.transform is None:
+            return [[0] * 19 for _ in range(19)]
+
         target_w, target_h = RecognitionConfig.TARGET_SIZE
         half_w = target_w // 2
         half_h = target_h // 2
+        pad = RecognitionConfig.PATCH_PADDING
+        padded = None
 
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                cx = int(margin + col * cell_size)
-                cy = int(margin + row * cell_size)
+        # All patches land in one RGB buffer, row-major over the grid
+        patches = np.empty((self.board_size**2, target_h, target_w, 3), dtype=np.uint8)
+        coords: List[Tuple[int, int]] = []
 
+        centers = self._grid_centers(w, margin, self.board_size)
+        for row, cy in enumerate(centers):
+            for col, cx in enumerate(centers):
                 y1, y2 = cy - half_h, cy + half_h
                 x1, x2 = cx - half_w, cx + half_w
 
                 if y1 < 0 or x1 < 0 or y2 > h or x2 > w:
-                    pad = RecognitionConfig.PATCH_PADDING
-                    padded = cv2.copyMakeBorder(
-                        warped_image, pad, pad, pad, pad, cv2.BORDER_REPLICATE
-                    )
+                    if padded is None:
+                        padded = cv2.copyMakeBorder(
+                            warped_image, pad, pad, pad, pad, cv2.BORDER_REPLICATE
+                        )
                     px, py = cx + pad, cy + pad
                     patch = padded[py - half_h : py + half_h, px - half_w : px + half_w]
                 else:
@@ -104,18 +121,22 @@ class StoneClassifier:
                 if patch.shape[:2] != RecognitionConfig.TARGET_SIZE:
                     patch = cv2.resize(patch, RecognitionConfig.TARGET_SIZE)
 
-                patch_rgb = cv2.cvtColor(patch, cv2.COLOR_BGR2RGB)
-                if self.transform:
-                    tensor = self.transform(patch_rgb)
-                    patches.append(tensor)
-                    coords.append((row, col))
+                patches[len(coords)] = patch[:, :, ::-1]  # BGR -> RGB
+                coords.append((row, col))
 
-        if not patches:
-            return [[0] * 19 for _ in range(19)]
+        if self.transform is self._default_transform:
+            # Same steps as the default Compose (the resize is a no-op at
+            # TARGET_SIZE), applied to the whole batch instead of per PIL image
+            batch = torch.from_numpy(patches).permute(0, 3, 1, 2).float().div(255)
+            mean = torch.tensor(RecognitionConfig.NORMALIZATION_MEAN)
+            std = torch.tensor(RecognitionConfig.NORMALIZATION_STD)
+            batch = batch.sub_(mean[:, None, None]).div_(std[:, None, None])
+        else:
+            batch = torch.stack([self.transform(patch) for patch in patches])
 
-        batch = torch.stack(patches).to(self.device)
+        batch = batch.to(self.device)
         self.model.eval()
-        with torch.no_grad():
+        with torch.inference_mode():
             outputs = self.model(batch)
             _, preds = torch.max(outputs, 1)
 
@@ -142,11 +163,9 @@ class StoneClassifier:
         samples = []
         coords = []
 
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                cx = int(margin + col * cell_size)
-                cy = int(margin + row * cell_size)
-
+        centers = self._grid_centers(w, margin, self.board_size)
+        for row, cy in enumerate(centers):
+            for col, cx in enumerate(centers):
                 if 0 <= cx < w and 0 <= cy < h:
                     y1, y2 = max(0, cy - radius), min(h, cy + radius)
                     x1, x2 = max(0, cx - radius), min(w, cx + radius)
@@ -253,10 +272,9 @@ class StoneClassifier:
         board = [[0] * 19 for _ in range(19)]
         hsv = cv2.cvtColor(warped_image, cv2.COLOR_BGR2HSV)
 
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                cx = int(margin + col * cell_size)
-                cy = int(margin + row * cell_size)
+        centers = self._grid_centers(w, margin, self.board_size)
+        for row, cy in enumerate(centers):
+            for col, cx in enumerate(centers):
                 y1, y2 = max(0, cy - stone_radius), min(h, cy + stone_radius)
                 x1, x2 = max(0, cx - stone_radius), min(w, cx + stone_radius)
                 patch_bgr = warped_image[y1:y2, x1:x2]
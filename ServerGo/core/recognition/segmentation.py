@@ -65,19 +65,21 @@ def cleanup_mask(mask: np.ndarray, target_size: Tuple[int, int]) -> np.ndarray:
     from skimage.transform import resize
     from skimage import measure
 
-    mask_resized = resize(mask.astype(float) / 255, (target_size[1], target_size[0]))
-    mask_binary = (mask_resized > 0.5).astype(np.uint8) * 255
+    mask_resized = resize(mask / 255.0, (target_size[1], target_size[0]))
+
+    # Threshold, erode, component selection and dilation all write into the
+    # same uint8 buffer rather than allocating a new mask per step
+    mask_clean: np.ndarray = (mask_resized > 0.5).astype(np.uint8)
+    mask_clean *= 255
 
     # Reduced kernel 5x5
     kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-    eroded = cv2.erode(mask_binary, kernel, iterations=2)
+    cv2.erode(mask_clean, kernel, dst=mask_clean, iterations=2)
 
-    labels = measure.label(eroded)
+    labels = measure.label(mask_clean)
     if labels.max() > 0:
         largest = np.argmax(np.bincount(labels.flat)[1:]) + 1
-        eroded_clean = (labels == largest).astype(np.uint8) * 255
-    else:
-        eroded_clean = eroded
+        np.multiply(labels == largest, 255, out=mask_clean, casting="unsafe")
 
-    mask_clean = cv2.dilate(eroded_clean, kernel, iterations=2)
+    cv2.dilate(mask_clean, kernel, dst=mask_clean, iterations=2)
     return mask_clean
@@ -11,9 +11,12 @@ Modifications have been made to integrate with this project's architecture.
 
 import copy
 import chardet
+import codecs
 import math
 import re
-from collections import defaultdict
+from collections import defaultdict, deque
+from functools import lru_cache
+from itertools import product
 from typing import Any, DefaultDict, Dict, List, Optional, Tuple, Union, cast
 
 
@@ -24,6 +27,9 @@ class ParseError(Exception):
 
 
 class Move:
+    # Games hold one Move per node; slots keep them to two fields, no instance dict
+    __slots__ = ("player", "coords")
+
     GTP_COORD = list("ABCDEFGHJKLMNOPQRSTUVWXYZ") + [
         xa + c for xa in "ABCDEFGH" for c in "ABCDEFGHJKLMNOPQRSTUVWXYZ"
     ]  # Support for board sizes > 25 (up to 52+)
@@ -74,17 +80,32 @@ class Move:
     def __hash__(self):
         return hash((self.coords, self.player))
 
+    # Coordinate strings depend only on the (immutable) coords tuple and board
+    # height, so memoize them per point. Both come from the untrusted SZ
+    # property, so the caches are bounded rather than sized to the board
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _gtp_coords(coords: Tuple[int, int]) -> str:
+        return Move.GTP_COORD[coords[0]] + str(coords[1] + 1)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _sgf_coords(coords: Tuple[int, int], board_height: int) -> str:
+        return (
+            f"{Move.SGF_COORD[coords[0]]}{Move.SGF_COORD[board_height - coords[1] - 1]}"
+        )
+
     def gtp(self):
         """Returns GTP coordinates of the move."""
-        if self.is_pass or self.coords is None:
+        if self.coords is None:
             return "pass"
-        return Move.GTP_COORD[self.coords[0]] + str(self.coords[1] + 1)
+        return Move._gtp_coords(self.coords)
 
     def sgf(self, board_size):
         """Returns SGF coordinates of the move."""
-        if self.is_pass or self.coords is None:
+        if self.coords is None:
             return ""
-        return f"{Move.SGF_COORD[self.coords[0]]}{Move.SGF_COORD[board_size[1] - self.coords[1] - 1]}"
+        return Move._sgf_coords(self.coords, board_size[1])
 
     @property
     def is_pass(self):
@@ -103,6 +124,11 @@ class Move:
 
 
 class SGFNode:
+    # Slotted to keep large game trees compact; subclasses may still add a __dict__
+    __slots__ = ("children", "properties", "_parent", "moves_cache", "_root", "_depth")
+
+    _DROP_LOWERCASE = str.maketrans("", "", "abcdefghijklmnopqrstuvwxyz")
+
     def __init__(
         self,
         parent: Optional["SGFNode"] = None,
@@ -111,15 +137,17 @@ class SGFNode:
     ):
         self.children: List["SGFNode"] = []
         self.properties: DefaultDict[str, List[Any]] = defaultdict(list)
+        # Parsers create one node per SGF node, so set the parent slot and the
+        # caches once here instead of via the parent setter and _clear_cache
+        self._parent: Optional["SGFNode"] = parent
+        self._clear_cache()
         if properties:
             for k, v in properties.items():
                 self.set_property(k, v)
-        self.parent: Optional["SGFNode"] = parent
-        if self.parent:
-            self.parent.children.append(self)
-        if parent and move:
-            self.set_property(move.player, move.sgf(self.board_size))
-        self._clear_cache()
+        if parent is not None:
+            parent.children.append(self)
+            if move:
+                self.set_property(move.player, move.sgf(self.board_size))
 
     def _clear_cache(self) -> None:
         self.moves_cache: Optional[List[Move]] = None
@@ -144,45 +172,49 @@ class SGFNode:
 
     @staticmethod
     def _escape_value(value):
-        return re.sub(r"([\]\\])", r"\\\1", value) if isinstance(value, str) else value
+        if isinstance(value, str) and ("]" in value or "\\" in value):
+            return re.sub(r"([\]\\])", r"\\\1", value)
+        return value
 
     @staticmethod
     def _unescape_value(value):
-        return re.sub(r"\\([\]\\])", r"\1", value) if isinstance(value, str) else value
+        if isinstance(value, str) and "\\" in value:
+            return re.sub(r"\\([\]\\])", r"\1", value)
+        return value
 
     def sgf(self, **xargs) -> str:
         """Generates an SGF string, calling sgf_properties on each node."""
 
-        def node_sgf_str(node):
-            return ";" + "".join(
-                [
-                    prop + "".join(f"[{self._escape_value(v)}]" for v in values)
-                    for prop, values in node.sgf_properties(**xargs).items()
-                    if values
-                ]
-            )
-
+        escape = self._escape_value
         stack: List[Union[str, SGFNode]] = [")", self, "("]
-        sgf_str = ""
+        parts: List[str] = []
+        append = parts.append
         while stack:
             item = stack.pop()
             if isinstance(item, str):
-                sgf_str += item
+                append(item)
             else:
-                # Mypy knows item is SGFNode here
-                sgf_str += node_sgf_str(item)
+                # Mypy knows item is SGFNode here; fragments go straight into parts
+                append(";")
+                for prop, values in item.sgf_properties(**xargs).items():
+                    if values:
+                        append(prop)
+                        for v in values:
+                            append(f"[{escape(v)}]")
                 if len(item.children) == 1:
                     stack.append(item.children[0])
                 elif item.children:
-                    stack += sum(
-                        [[")", c, "("] for c in item.ordered_children[::-1]], []
-                    )
-        return sgf_str
+                    for c in item.ordered_children[::-1]:
+                        stack += [")", c, "("]
+        return "".join(parts)
 
     def add_list_property(self, property: str, values: List):
         """Add values to the property list."""
-        # Normalize property names (e.g., SiZe[19] -> SZ[19])
-        normalized_property = re.sub("[a-z]", "", property)
+        # Normalize property names (e.g., SiZe[19] -> SZ[19]); names are almost
+        # always already uppercase, so skip the rewrite for those
+        normalized_property = (
+            property if property.isupper() else property.translate(self._DROP_LOWERCASE)
+        )
         self._clear_cache()
         self.properties[normalized_property] += values
 
@@ -220,20 +252,30 @@ class SGFNode:
     def root(self) -> "SGFNode":
         """Returns the root of the tree (cached)."""
         if self._root is None:
-            self._root = self.parent.root if self.parent else self
+            node = self
+            while node._root is None and node.parent is not None:
+                node = node.parent
+            self._root = node._root if node._root is not None else node
         return self._root
 
     @property
     def depth(self) -> int:
         """Returns the depth of this node (root is 0)."""
         if self._depth is None:
-            moves = self.moves
-            if self.is_root:
-                self._depth = 0
-            else:
-                assert self.parent is not None
-                self._depth = self.parent.depth + len(moves)
-        return self._depth
+            # Walk up to the nearest cached ancestor, then fill in depths downwards
+            chain = []
+            node: Optional[SGFNode] = self
+            while node is not None and node._depth is None:
+                chain.append(node)
+                node = node.parent
+            for n in reversed(chain):
+                moves = n.moves
+                if n.is_root:
+                    n._depth = 0
+                else:
+                    assert n.parent is not None and n.parent._depth is not None
+                    n._depth = n.parent._depth + len(moves)
+        return cast(int, self._depth)
 
     @property
     def board_size(self) -> Tuple[int, int]:
@@ -296,10 +338,16 @@ class SGFNode:
                 from_coord, to_coord = [
                     Move.from_sgf(c, board_size=board_size) for c in p.split(":")[:2]
                 ]
-                for x in range(from_coord.coords[0], to_coord.coords[0] + 1):
-                    for y in range(to_coord.coords[1], from_coord.coords[1] + 1):
-                        if 0 <= x < board_size[0] and 0 <= y < board_size[1]:
-                            coords.add(Move((x, y), player=player))
+                # Clip the rectangle to the board once instead of bounds-checking every point
+                xs = range(
+                    max(from_coord.coords[0], 0),
+                    min(to_coord.coords[0], board_size[0] - 1) + 1,
+                )
+                ys = range(
+                    max(to_coord.coords[1], 0),
+                    min(from_coord.coords[1], board_size[1] - 1) + 1,
+                )
+                coords.update(Move(xy, player=player) for xy in product(xs, ys))
             return list(coords)
         else:
             return [
@@ -348,12 +396,12 @@ class SGFNode:
     @property
     def nodes_in_tree(self) -> List:
         """Returns all nodes in the tree rooted at this node."""
-        stack = [self]
+        queue = deque([self])
         nodes = []
-        while stack:
-            item = stack.pop(0)
+        while queue:
+            item = queue.popleft()
             nodes.append(item)
-            stack += item.children
+            queue.extend(item.children)
         return nodes
 
     @property
@@ -474,14 +522,19 @@ class SGF:
     DEFAULT_ENCODING = "UTF-8"
 
     _NODE_CLASS = SGFNode
+    # Possessive runs keep unterminated values from backtracking char by char
     SGFPROP_PAT = re.compile(
-        r"\s*(?:\(|\)|;|(\w+)((\s*\[([^\]\\]|\\.)*\])+))", flags=re.DOTALL
+        r"\s*(?:\(|\)|;|(\w+)((?:\s*\[(?:[^\]\\]++|\\.)*+\])+))", flags=re.DOTALL
     )
     SGF_PAT = re.compile(r"\(;.*\)", flags=re.DOTALL)
+    TRAILING_CLOSE_PAT = re.compile(r"\s*\)\s*\Z")
+    VALUE_SPLIT_PAT = re.compile(r"\]\s*\[")
 
     @classmethod
     def parse_sgf(cls, input_str) -> SGFNode:
-        """Parse a string as SGF."""
+        """Parse a string (or UTF-8 encoded bytes) as SGF."""
+        if isinstance(input_str, (bytes, bytearray)):
+            input_str = input_str.decode(cls.DEFAULT_ENCODING, errors="ignore")
         match = re.search(cls.SGF_PAT, input_str)
         clipped_str = match.group() if match else input_str
         root = cls(clipped_str).root
@@ -511,14 +564,7 @@ class SGF:
                 if is_gib or is_ngf or b"AP[foxwq]" in bin_contents:
                     encoding = "utf8"
                 else:  # sgf
-                    match = re.search(rb"CA\[(.*?)\]", bin_contents)
-                    if match:
-                        encoding = match[1].decode("ascii", errors="ignore")
-                    else:
-                        encoding = chardet.detect(bin_contents[:300])["encoding"]
-                        # Workaround for some compatibility issues for Windows-1252 and GB2312 encodings
-                        if encoding == "Windows-1252" or encoding == "GB2312":
-                            encoding = "GBK"
+                    encoding = cls._detect_encoding(bin_contents)
             try:
                 decoded = bin_contents.decode(encoding=encoding, errors="ignore")
             except LookupError:
@@ -533,6 +579,30 @@ class SGF:
                 return cls.parse_sgf(decoded)
         return cls._NODE_CLASS()  # Fallback for structural safety
 
+    @classmethod
+    def _detect_encoding(cls, bin_contents: bytes) -> str:
+        """Pick an encoding for raw SGF bytes, using chardet only as a last resort."""
+        for bom, bom_encoding in (
+            (codecs.BOM_UTF8, "utf-8-sig"),
+            (codecs.BOM_UTF16_LE, "utf-16"),
+            (codecs.BOM_UTF16_BE, "utf-16"),
+        ):
+            if bin_contents.startswith(bom):
+                return bom_encoding
+        match = re.search(rb"CA\[(.*?)\]", bin_contents)
+        if match:
+            return match[1].decode("ascii", errors="ignore")
+        try:
+            bin_contents.decode("utf-8")
+            return "utf-8"
+        except UnicodeDecodeError:
+            pass
+        encoding = chardet.detect(bin_contents[:300])["encoding"]
+        # Workaround for some compatibility issues for Windows-1252 and GB2312 encodings
+        if encoding == "Windows-1252" or encoding == "GB2312":
+            encoding = "GBK"
+        return encoding or cls.DEFAULT_ENCODING
+
     def __init__(self, contents):
         self.contents = contents
         try:
@@ -545,31 +615,45 @@ class SGF:
         self._parse_branch(self.root)
 
     def _parse_branch(self, current_move: SGFNode):
+        # Enclosing branches' current nodes; an explicit stack instead of recursion
+        # so deeply nested variations cannot hit the recursion limit
+        open_branches: List[SGFNode] = []
         while self.ix < len(self.contents):
-            match = re.match(self.SGFPROP_PAT, self.contents[self.ix :])
+            # Match in place rather than on a slice, which copied the rest of the input per token
+            match = self.SGFPROP_PAT.match(self.contents, self.ix)
             if not match:
                 break
-            self.ix += len(match[0])
-            matched_item = match[0].strip()
+            self.ix = match.end()
+            property = match[1]
+            if property is not None:
+                # Slice the values straight out of the input: one copy, no strip
+                value = self.contents[
+                    self.contents.index("[", match.start(2)) + 1 : match.end(2) - 1
+                ]
+                values = self.VALUE_SPLIT_PAT.split(value) if "]" in value else [value]
+                current_move.add_list_property(
+                    property, [SGFNode._unescape_value(v) for v in values]
+                )
+                continue
+            # Punctuation tokens end the match, so read the single character
+            matched_item = self.contents[self.ix - 1]
             if matched_item == ")":
-                return
-            if matched_item == "(":
-                self._parse_branch(self._NODE_CLASS(parent=current_move))
-            elif matched_item == ";":
+                if not open_branches:
+                    return
+                current_move = open_branches.pop()
+            elif matched_item == "(":
+                open_branches.append(current_move)
+                current_move = self._NODE_CLASS(parent=current_move)
+            else:
                 # Ignore ;) for old SGF
                 useless = (
                     self.ix < len(self.contents)
-                    and self.contents[self.ix :].strip() == ")"
+                    and self.TRAILING_CLOSE_PAT.match(self.contents, self.ix)
+                    is not None
                 )
                 # Ignore ; that generate empty nodes
                 if not (current_move.empty or useless):
                     current_move = self._NODE_CLASS(parent=current_move)
-            else:
-                property, value = match[1], match[2].strip()[1:-1]
-                values = re.split(r"\]\s*\[", value)
-                current_move.add_list_property(
-                    property, [SGFNode._unescape_value(v) for v in values]
-                )
         if self.ix < len(self.contents):
             raise ParseError(
                 f"Parse Error: unexpected character at {self.contents[self.ix:self.ix+25]}"
@@ -758,6 +842,47 @@ class SGF:
         lines = gib.split("\n")
         for line in lines:
             line = line.strip()
+
+            # Move lines make up most of a record; handle them before the header checks
+            if line[0:3] == "STO":
+                move = line.split()
+                key = "B" if move[3] == "1" else "W"
+                try:
+                    x = int(move[4])
+                    y = 18 - int(move[5])
+                    if not (0 <= x < 19 and 0 <= y < 19):
+                        raise ParseError(
+                            f"Coordinates for move ({x},{y}) out of range on line {line}"
+                        )
+                    value = Move(coords=(x, y)).sgf(board_size=(19, 19))
+                except IndexError:
+                    continue
+
+                node = cls._NODE_CLASS(parent=node)
+                node.set_property(key, value)
+                continue
+
+            if line[0:3] == "INI":
+                if node is not root:
+                    raise ParseError("Node is not root")
+                setup = line.split()
+                try:
+                    handicap = int(setup[3])
+                except ParseError:
+                    continue
+
+                if handicap < 0 or handicap > 9:
+                    raise ParseError(f"Handicap {handicap} out of range")
+
+                if handicap >= 2:
+                    root.set_property("HA", handicap)
+                    root.place_handicap_stones(handicap, tygem=True)
+                continue
+
+            # Everything else we read is a \[TAG=...\] header line
+            if not line.startswith("\\["):
+                continue
+
             if line.startswith("\\[GAMEBLACKNAME=") and line.endswith("\\]"):
                 s = line[16:-2]
                 name, rank = parse_player_name(s)
@@ -814,39 +939,6 @@ class SGF:
                     except:  # noqa E722
                         pass
 
-            if line[0:3] == "INI":
-                if node is not root:
-                    raise ParseError("Node is not root")
-                setup = line.split()
-                try:
-                    handicap = int(setup[3])
-                except ParseError:
-                    continue
-
-                if handicap < 0 or handicap > 9:
-                    raise ParseError(f"Handicap {handicap} out of range")
-
-                if handicap >= 2:
-                    root.set_property("HA", handicap)
-                    root.place_handicap_stones(handicap, tygem=True)
-
-            if line[0:3] == "STO":
-                move = line.split()
-                key = "B" if move[3] == "1" else "W"
-                try:
-                    x = int(move[4])
-                    y = 18 - int(move[5])
-                    if not (0 <= x < 19 and 0 <= y < 19):
-                        raise ParseError(
-                            f"Coordinates for move ({x},{y}) out of range on line {line}"
-                        )
-                    value = Move(coords=(x, y)).sgf(board_size=(19, 19))
-                except IndexError:
-                    continue
-
-                node = cls._NODE_CLASS(parent=node)
-                node.set_property(key, value)
-
         if len(root.children) == 0:  # We'll assume we failed in this case
             raise ParseError("No valid nodes found")
 
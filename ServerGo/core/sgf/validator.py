@@ -3,7 +3,11 @@ SGF Content Validator
 Validates and sanitizes SGF content before processing.
 """
 
+import hashlib
 import re
+import threading
+from collections import OrderedDict
+from typing import Optional
 
 
 class SGFValidationError(Exception):
@@ -35,6 +39,21 @@ class SGFValidator:
         r"<embed",
     ]
 
+    # All suspicious patterns in one alternation, so clean content is scanned once
+    _SUSPICIOUS_RE = re.compile(
+        "|".join(f"(?:{pattern})" for pattern in SUSPICIOUS_PATTERNS), re.IGNORECASE
+    )
+    # Case-sensitive twin for ASCII content lowered up front; IGNORECASE makes the
+    # engine fold every character it visits, which dominates the scan
+    _SUSPICIOUS_LOWER_RE = re.compile(
+        "|".join(f"(?:{pattern})" for pattern in SUSPICIOUS_PATTERNS)
+    )
+
+    # Structural tokens for the balance checks, scanned by the regex engine
+    # instead of a per-character Python loop
+    _PAREN_PAT = re.compile(r"[()]")
+    _BRACKET_PAT = re.compile(r"\\.|[\[\]]", flags=re.DOTALL)
+
     @classmethod
     def validate(cls, content: str) -> str:
         """
@@ -89,34 +108,25 @@ class SGFValidator:
             # Allow missing GM property but warn
             pass
 
-        # Check balanced parentheses
+        # Check balanced parentheses: mismatched totals fail on two C-level counts,
+        # and only then is the ordering walked, visiting just the parens
+        if content.count("(") != content.count(")"):
+            raise SGFValidationError("Unbalanced parentheses in SGF")
+
         depth = 0
-        for char in content:
-            if char == "(":
-                depth += 1
-            elif char == ")":
-                depth -= 1
+        for paren in cls._PAREN_PAT.findall(content):
+            depth += 1 if paren == "(" else -1
             if depth < 0:
                 raise SGFValidationError("Unbalanced parentheses in SGF")
 
-        if depth != 0:
-            raise SGFValidationError("Unbalanced parentheses in SGF")
-
-        # Check balanced brackets
+        # Check balanced brackets; escape pairs are consumed whole by the pattern
         in_bracket = False
-        escaped = False
-        for char in content:
-            if escaped:
-                escaped = False
-                continue
-            if char == "\\":
-                escaped = True
-                continue
-            if char == "[":
+        for token in cls._BRACKET_PAT.findall(content):
+            if token == "[":
                 if in_bracket:
                     raise SGFValidationError("Nested brackets in SGF")
                 in_bracket = True
-            elif char == "]":
+            elif token == "]":
                 if not in_bracket:
                     raise SGFValidationError("Unmatched closing bracket in SGF")
                 in_bracket = False
@@ -127,10 +137,17 @@ class SGFValidator:
     @classmethod
     def _check_suspicious_patterns(cls, content: str) -> None:
         """Check for potentially malicious content."""
-        content_lower = content.lower()
-
+        # Non-ASCII text keeps the IGNORECASE scan for Unicode case-folding rules
+        if content.isascii():
+            match = cls._SUSPICIOUS_LOWER_RE.search(content.lower())
+        else:
+            match = cls._SUSPICIOUS_RE.search(content)
+        if match is None:
+            return
+
+        # Rejected: report the first listed pattern that matched
         for pattern in cls.SUSPICIOUS_PATTERNS:
-            if re.search(pattern, content_lower, re.IGNORECASE):
+            if re.search(pattern, content, re.IGNORECASE):
                 raise SGFValidationError(
                     f"SGF contains suspicious content matching pattern: {pattern}"
                 )
@@ -158,10 +175,21 @@ class SGFValidator:
             )
 
 
+# Verdicts of recent validate_sgf calls, keyed by a digest of the content plus
+# the SGFValidator limits in force, so retried/re-analyzed games skip the scans
+# and changed limits never reuse old verdicts. None means the content was
+# valid, otherwise the value is the SGFValidationError message.
+_VALIDATE_CACHE_SIZE = 2048
+_validate_cache: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
+_validate_cache_lock = threading.Lock()
+
+
 def validate_sgf(content: str) -> str:
     """
     Convenience function for SGF validation.
 
+    Results are memoized per content (see ``validate_sgf.cache_clear``).
+
     Args:
         content: Raw SGF string
 
@@ -171,4 +199,47 @@ def validate_sgf(content: str) -> str:
     Raises:
         SGFValidationError: If validation fails
     """
-    return SGFValidator.validate(content)
+    if not isinstance(content, str) or not content:
+        return SGFValidator.validate(content)
+
+    digest = hashlib.blake2b(
+        content.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+    key = (
+        digest,
+        SGFValidator.MAX_FILE_SIZE,
+        SGFValidator.MAX_MOVES,
+        SGFValidator.MAX_VARIATIONS,
+    )
+    with _validate_cache_lock:
+        cached = key in _validate_cache
+        if cached:
+            _validate_cache.move_to_end(key)
+            error = _validate_cache[key]
+    if cached:
+        if error is not None:
+            raise SGFValidationError(error)
+        return content.strip()
+
+    try:
+        result = SGFValidator.validate(content)
+    except SGFValidationError as e:
+        _remember_verdict(key, str(e))
+        raise
+    _remember_verdict(key, None)
+    return result
+
+
+def _remember_verdict(key: tuple, error: Optional[str]) -> None:
+    with _validate_cache_lock:
+        _validate_cache[key] = error
+        if len(_validate_cache) > _VALIDATE_CACHE_SIZE:
+            _validate_cache.popitem(last=False)
+
+
+def _clear_validate_cache() -> None:
+    with _validate_cache_lock:
+        _validate_cache.clear()
+
+
+validate_sgf.cache_clear = _clear_validate_cache  # type: ignore[attr-defined]
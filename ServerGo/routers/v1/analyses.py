@@ -3,12 +3,15 @@ V1 Analyses Router
 Handles SGF analysis requests.
 """
 
-import json
+import asyncio
 import logging
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Depends
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Response
 from fastapi.responses import StreamingResponse
 
+from services.analysis_cache import AnalysisCache, get_analysis_cache
 from services.katago_service import KataGoService, get_katago_service
 from middleware.auth import verify_api_key
 from schemas.v1 import AnalysisRequest, AnalysisResponse, AnalysisData
@@ -17,11 +20,22 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Same options as FastAPI's ORJSONResponse: numeric dict keys and NumPy scalars
+# from the engine serialize instead of raising
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _sse_event(payload) -> bytes:
+    """Frame one JSON payload as an SSE data event."""
+    return b"data: " + orjson.dumps(payload, option=_ORJSON_OPTIONS) + b"\n\n"
+
 
 @router.post("", response_model=AnalysisResponse)
 async def create_analysis(
     request: AnalysisRequest,
+    response: Response,
     service: KataGoService = Depends(get_katago_service),
+    cache: Optional[AnalysisCache] = Depends(get_analysis_cache),
     api_key: str = Depends(verify_api_key),
 ):
     """
@@ -30,6 +44,18 @@ async def create_analysis(
     # Validate SGF
     logger.info(f"V1 Analysis payload: visits={request.visits}")
 
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(
+            request.sgf, request.visits, request.start_turn, request.end_turn
+        )
+        cached_sgf = await asyncio.to_thread(cache.get, cache_key)
+        if cached_sgf is not None:
+            response.headers["X-Analysis-Cache"] = "hit"
+            return AnalysisResponse(
+                data=AnalysisData(sgf=cached_sgf, visits_used=request.visits)
+            )
+
     try:
         # Run blocking analysis
         # KataGoService.analyze validates the SGF internally
@@ -40,6 +66,10 @@ async def create_analysis(
             end_turn=request.end_turn,
         )
 
+        if cache is not None and cache_key is not None:
+            await asyncio.to_thread(cache.put, cache_key, analyzed_sgf)
+            response.headers["X-Analysis-Cache"] = "miss"
+
         return AnalysisResponse(
             data=AnalysisData(sgf=analyzed_sgf, visits_used=request.visits)
         )
@@ -81,13 +111,13 @@ async def stream_analysis_live(
                 start_turn=request.start_turn,
                 end_turn=request.end_turn,
             ):
-                yield f"data: {json.dumps(item)}\n\n"
+                yield _sse_event(item)
 
-            yield f"data: {json.dumps({'done': True})}\n\n"
+            yield _sse_event({"done": True})
 
         except Exception as e:
             logger.error(f"Streaming error: {e}")
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            yield _sse_event({"error": str(e)})
 
     return StreamingResponse(
         event_generator(),
@@ -95,5 +125,7 @@ async def stream_analysis_live(
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
+            # Stop nginx-style proxies from buffering events until the stream ends
+            "X-Accel-Buffering": "no",
         },
     )
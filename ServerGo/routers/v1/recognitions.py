@@ -33,6 +33,12 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _encode_jpeg_base64(image: np.ndarray, quality: int) -> str:
+    """JPEG-encode an image and return it as a base64 string."""
+    _, buf = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return base64.b64encode(buf.tobytes()).decode("utf-8")
+
+
 @router.post("", response_model=RecognitionResponse)
 async def recognize_board(
     image: UploadFile = File(..., description="Go board image"),
@@ -139,8 +145,7 @@ async def detect_corners_only(
     preview_corners = preview_corners.reshape((-1, 1, 2))
     cv2.polylines(preview, [preview_corners], True, (0, 255, 0), 3)
 
-    _, buf = cv2.imencode(".jpg", preview, [cv2.IMWRITE_JPEG_QUALITY, 80])
-    b64 = base64.b64encode(buf.tobytes()).decode("utf-8")
+    b64 = _encode_jpeg_base64(preview, quality=80)
 
     return CornersResponse(
         data=CornersData(
@@ -217,8 +222,7 @@ async def classify_with_corners(
     sgf = board_to_sgf(board, board_size)
 
     # Encode warped image for frontend editing
-    _, buf = cv2.imencode(".jpg", warped, [cv2.IMWRITE_JPEG_QUALITY, 85])
-    warped_b64 = base64.b64encode(buf.tobytes()).decode("utf-8")
+    warped_b64 = _encode_jpeg_base64(warped, quality=85)
 
     return RecognitionResponse(
         data=RecognitionData(
@@ -0,0 +1,148 @@
+"""
+Analysis Cache - Persistent store of finished KataGo analyses.
+Repeated requests for the same SGF and settings skip the engine entirely.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional
+
+import orjson
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+def engine_fingerprint(paths: Iterable[str]) -> str:
+    """
+    Identify the KataGo binary, model and config in use.
+
+    Path, size and mtime of each file, so swapping in a new network or config
+    (even at the same path) yields a new fingerprint and old results go stale.
+    """
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append([path, st.st_size, st.st_mtime_ns])
+        except OSError:
+            parts.append([path, None, None])
+    return hashlib.blake2b(orjson.dumps(parts), digest_size=8).hexdigest()
+
+
+class AnalysisCache:
+    """SQLite-backed map from request hash to analyzed SGF, bounded by age and size."""
+
+    def __init__(
+        self,
+        path: str,
+        engine_id: str = "",
+        max_entries: int = 10_000,
+        ttl_sec: float = 7 * 24 * 3600,
+    ):
+        self.path = path
+        self.engine_id = engine_id
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def make_key(
+        self,
+        sgf: str,
+        visits: int,
+        start_turn: Optional[int] = None,
+        end_turn: Optional[int] = None,
+    ) -> str:
+        """Hash everything that changes the engine output, including the engine."""
+        blob = orjson.dumps([self.engine_id, sgf, visits, start_turn, end_turn])
+        return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use so importing the module never touches the disk
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS analyses "
+                "(key TEXT PRIMARY KEY, payload BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS analyses_created_at ON analyses (created_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached analyzed SGF, or None on a miss, expiry or cache error."""
+        try:
+            with self._lock:
+                row = (
+                    self._connect()
+                    .execute(
+                        "SELECT payload FROM analyses WHERE key = ? AND created_at >= ?",
+                        (key, time.time() - self.ttl_sec),
+                    )
+                    .fetchone()
+                )
+        except sqlite3.Error as e:
+            logger.warning("Analysis cache read failed: %s", e)
+            return None
+        return None if row is None else bytes(row[0]).decode("utf-8")
+
+    def put(self, key: str, sgf: str) -> None:
+        """Store an analyzed SGF and prune; failures are logged, never raised."""
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO analyses (key, payload, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, sgf.encode("utf-8"), now),
+                )
+                # Drop expired rows, then the oldest beyond the row cap
+                conn.execute(
+                    "DELETE FROM analyses WHERE created_at < ?", (now - self.ttl_sec,)
+                )
+                conn.execute(
+                    "DELETE FROM analyses WHERE key IN (SELECT key FROM analyses "
+                    "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("Analysis cache write failed: %s", e)
+
+    def close(self) -> None:
+        """Close the underlying connection, if open."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Singleton instance, only when enabled via ANALYSIS_CACHE
+analysis_cache: Optional[AnalysisCache] = (
+    AnalysisCache(
+        config.ANALYSIS_CACHE_PATH,
+        engine_id=engine_fingerprint(
+            [config.KATAGO_PATH, config.KATAGO_MODEL, config.KATAGO_CONFIG]
+        ),
+        max_entries=config.ANALYSIS_CACHE_MAX_ENTRIES,
+        ttl_sec=config.ANALYSIS_CACHE_TTL_SEC,
+    )
+    if config.ANALYSIS_CACHE
+    else None
+)
+
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """Dependency provider for AnalysisCache (None when caching is disabled)"""
+    return analysis_cache
@@ -29,6 +29,8 @@ class RecognitionResult:
 class RecognitionService:
     """Async service for Go board recognition."""
 
+    __slots__ = ("_recognizer", "_initialized")
+
     def __init__(self):
         self._recognizer: Optional[UniversalGoRecognizer] = None
         self._initialized = False
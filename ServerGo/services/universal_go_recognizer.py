@@ -1,6 +1,10 @@
 import cv2
+import hashlib
 import numpy as np
 import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple, List
 import torch
@@ -8,6 +12,7 @@ import torch.nn as nn
 
 from torchvision.models.segmentation import deeplabv3_resnet50
 
+from config import config
 from core.recognition.classifier import StoneClassifier
 from core.recognition.models import ResNet9
 from core.recognition.segmentation import predict_mask, cleanup_mask
@@ -17,14 +22,39 @@ logger = logging.getLogger(__name__)
 
 
 class UniversalGoRecognizer:
+    # Warp sampling maps kept for recent board poses (e.g. frames of one video)
+    _WARP_MAPS_CACHE_SIZE = 8
+    # Board masks kept for recently segmented frames (e.g. a static webcam board)
+    _MASK_CACHE_SIZE = 8
+
     def __init__(self) -> None:
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.board_size = 19
         self.model: Optional[nn.Module] = None
         self.classifier: Optional[nn.Module] = None
         self.classifier_instance: Optional[StoneClassifier] = None
+        self._warp_maps: "OrderedDict[tuple, Tuple[np.ndarray, np.ndarray]]" = (
+            OrderedDict()
+        )
+        self._warp_maps_lock = threading.Lock()
+        self._masks: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        # Segmentation model the cached masks were produced by
+        self._masks_model: Optional[nn.Module] = None
+        self._masks_lock = threading.Lock()
+        self._use_cuda_warp = config.USE_CUDA_WARP and self._cuda_warp_available()
         self._load_models()
 
+    @staticmethod
+    def _cuda_warp_available() -> bool:
+        """Whether this OpenCV build has the CUDA warping module and a device."""
+        cuda = getattr(cv2, "cuda", None)
+        if cuda is None or not hasattr(cuda, "warpPerspective"):
+            return False
+        try:
+            return bool(cuda.getCudaEnabledDeviceCount() > 0)
+        except cv2.error:
+            return False
+
     def _load_models(self) -> None:
         # 1. Segmentation Model (DeepLabV3+ ResNet50)
         try:
@@ -93,15 +123,34 @@ class UniversalGoRecognizer:
     def _intersect_lines(
         self, rho1: float, theta1: float, rho2: float, theta2: float
     ) -> Optional[List[float]]:
-        A = np.array(
-            [[np.cos(theta1), np.sin(theta1)], [np.cos(theta2), np.sin(theta2)]]
-        )
-        b = np.array([[rho1], [rho2]])
-        try:
-            x0, y0 = np.linalg.solve(A, b)
-            return [x0[0], y0[0]]
-        except Exception:
+        x0, y0 = self._intersect_lines_batch(
+            np.array([rho1]), np.array([theta1]), np.array([rho2]), np.array([theta2])
+        )[0]
+        if np.isnan(x0):
             return None
+        return [x0, y0]
+
+    @staticmethod
+    def _intersect_lines_batch(
+        rhos1: np.ndarray,
+        thetas1: np.ndarray,
+        rhos2: np.ndarray,
+        thetas2: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Intersect pairs of Hough lines (rho = x*cos(theta) + y*sin(theta)).
+
+        Solves every 2x2 system at once with Cramer's rule; (near-)parallel
+        pairs come back as NaN rows. Returns an (n, 2) array of [x, y].
+        """
+        cos1, sin1 = np.cos(thetas1), np.sin(thetas1)
+        cos2, sin2 = np.cos(thetas2), np.sin(thetas2)
+        det = cos1 * sin2 - sin1 * cos2
+        parallel = np.abs(det) < 1e-9
+        det = np.where(parallel, np.nan, det)
+        x = (rhos1 * sin2 - sin1 * rhos2) / det
+        y = (cos1 * rhos2 - rhos1 * cos2) / det
+        return np.stack([x, y], axis=-1)
 
     def _find_corners(self, mask: np.ndarray) -> Optional[np.ndarray]:
         # 1. Hough Lines
@@ -126,23 +175,23 @@ class UniversalGoRecognizer:
                             break
 
                 if len(strong_lines) >= 4:
-                    intersections = []
-                    for i in range(len(strong_lines)):
-                        for j in range(i + 1, len(strong_lines)):
-                            rho1, theta1 = strong_lines[i]
-                            rho2, theta2 = strong_lines[j]
-                            angle_diff = abs(theta1 - theta2)
-                            angle_diff = min(angle_diff, abs(angle_diff - np.pi))
-                            if angle_diff > 0.2:
-                                pt = self._intersect_lines(rho1, theta1, rho2, theta2)
-                                if pt:
-                                    h, w = mask.shape
-                                    if (
-                                        -100 < pt[0] < w + 100
-                                        and -100 < pt[1] < h + 100
-                                    ):
-                                        intersections.append(pt)
-                    pts = np.array(intersections, dtype=np.float32)
+                    rhos, thetas = np.array(strong_lines, dtype=np.float64).T
+                    i, j = np.triu_indices(len(strong_lines), k=1)
+                    angle_diff = np.abs(thetas[i] - thetas[j])
+                    angle_diff = np.minimum(angle_diff, np.abs(angle_diff - np.pi))
+                    i, j = i[angle_diff > 0.2], j[angle_diff > 0.2]
+                    candidates = self._intersect_lines_batch(
+                        rhos[i], thetas[i], rhos[j], thetas[j]
+                    )
+                    # NaN rows (parallel lines) fail these comparisons and drop out
+                    h, w = mask.shape
+                    inside = (
+                        (-100 < candidates[:, 0])
+                        & (candidates[:, 0] < w + 100)
+                        & (-100 < candidates[:, 1])
+                        & (candidates[:, 1] < h + 100)
+                    )
+                    pts = candidates[inside].astype(np.float32)
                     if len(pts) >= 4:
                         hull = cv2.convexHull(pts)
                         peri = cv2.arcLength(hull, True)
@@ -166,14 +215,11 @@ class UniversalGoRecognizer:
         return self._order_corners(box)
 
     def _order_corners(self, pts: np.ndarray) -> np.ndarray:
-        # Centroid-Angle Ordering
+        # Centroid-Angle Ordering: all angles in one arctan2, stable like sorted()
+        pts = np.asarray(pts)
         center = np.mean(pts, axis=0)
-
-        def get_angle(pt):
-            return np.arctan2(pt[1] - center[1], pt[0] - center[0])
-
-        sorted_pts = sorted(pts, key=get_angle)
-        return np.array(sorted_pts, dtype=np.float32)
+        angles = np.arctan2(pts[:, 1] - center[1], pts[:, 0] - center[0])
+        return pts[np.argsort(angles, kind="stable")].astype(np.float32)
 
     def _warp_board(
         self,
@@ -198,10 +244,61 @@ class UniversalGoRecognizer:
             dtype=np.float32,
         )
 
-        M = cv2.getPerspectiveTransform(pts1, pts2)
-        dst = cv2.warpPerspective(image, M, (output_size, output_size))
+        if self._use_cuda_warp:
+            try:
+                return self._warp_board_cuda(image, pts1, pts2, output_size)
+            except cv2.error as e:
+                logger.warning(f"CUDA warp failed, falling back to CPU: {e}")
+                self._use_cuda_warp = False
+
+        map1, map2 = self._warp_maps_for(pts1, pts2, output_size, margin)
+        dst = cv2.remap(image, map1, map2, cv2.INTER_LINEAR)
         return dst
 
+    @staticmethod
+    def _warp_board_cuda(
+        image: np.ndarray, pts1: np.ndarray, pts2: np.ndarray, output_size: int
+    ) -> np.ndarray:
+        """Same warp as the CPU remap path, run with cv2.cuda.warpPerspective."""
+        M = cv2.getPerspectiveTransform(pts1, pts2)
+        gpu_img = cv2.cuda_GpuMat()  # type: ignore[attr-defined]
+        gpu_img.upload(image)
+        gpu_out = cv2.cuda.warpPerspective(  # type: ignore[attr-defined]
+            gpu_img, M, (output_size, output_size), flags=cv2.INTER_LINEAR
+        )
+        return np.asarray(gpu_out.download())
+
+    def _warp_maps_for(
+        self, pts1: np.ndarray, pts2: np.ndarray, output_size: int, margin: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fixed-point sampling maps equivalent to warpPerspective for this pose.
+
+        Building the maps and remapping costs no more than warpPerspective, and
+        repeated poses (video frames of a static board) skip the map build.
+        """
+        key = (pts1.tobytes(), output_size, margin)
+        with self._warp_maps_lock:
+            maps = self._warp_maps.get(key)
+            if maps is not None:
+                self._warp_maps.move_to_end(key)
+                return maps
+
+        M = cv2.getPerspectiveTransform(pts1, pts2)
+        # With identity camera matrices and no distortion, the rectify map
+        # samples the source at M^-1 * (x, y, 1) like warpPerspective does
+        identity = np.eye(3)
+        map1, map2 = cv2.initUndistortRectifyMap(
+            identity, np.zeros(4), M, identity, (output_size, output_size), cv2.CV_16SC2
+        )
+        maps = (np.asarray(map1), np.asarray(map2))
+
+        with self._warp_maps_lock:
+            self._warp_maps[key] = maps
+            if len(self._warp_maps) > self._WARP_MAPS_CACHE_SIZE:
+                self._warp_maps.popitem(last=False)
+        return maps
+
     def detect_corners(self, image: np.ndarray) -> Optional[np.ndarray]:
         """
         Public API: Detect grid corners in an image.
@@ -221,8 +318,7 @@ class UniversalGoRecognizer:
             return None
 
         # Predict Mask
-        mask_small = predict_mask(self.model, img_rgb, self.device)
-        mask_clean = cleanup_mask(mask_small, (inference_size, inference_size))
+        mask_clean = self._board_mask(img_rgb, inference_size)
 
         # Find Corners on 800x800
         corners_800 = self._find_corners(mask_clean)
@@ -240,6 +336,39 @@ class UniversalGoRecognizer:
 
         return corners_original
 
+    def _board_mask(self, img_rgb: np.ndarray, inference_size: int) -> np.ndarray:
+        """
+        Segment and clean the board mask, reusing it for byte-identical frames.
+
+        The key is a digest of the resized frame, so only exact repeats hit;
+        hashing costs about a millisecond against a two-pass DeepLab forward.
+        Cached masks are read-only and are dropped when self.model changes.
+        """
+        model = self.model
+        digest = hashlib.blake2b(img_rgb.tobytes(), digest_size=16).digest()
+        key = (img_rgb.shape, inference_size, digest)
+        with self._masks_lock:
+            if self._masks_model is not model:
+                self._masks.clear()
+                self._masks_model = model
+            mask = self._masks.get(key)
+            if mask is not None:
+                self._masks.move_to_end(key)
+                return mask
+
+        mask_small = predict_mask(model, img_rgb, self.device)
+        mask = cleanup_mask(mask_small, (inference_size, inference_size))
+        # Shared with later cache hits, so no caller may edit it in place
+        mask.setflags(write=False)
+
+        with self._masks_lock:
+            # Skip storing if the model was swapped while this mask was computed
+            if self._masks_model is model:
+                self._masks[key] = mask
+                if len(self._masks) > self._MASK_CACHE_SIZE:
+                    self._masks.popitem(last=False)
+        return mask
+
     def classify_from_corners(
         self, image: np.ndarray, corners: np.ndarray
     ) -> Tuple[List[List[int]], np.ndarray]:
@@ -293,24 +422,31 @@ class UniversalGoRecognizer:
         return [[0] * 19 for _ in range(19)]
 
 
+@lru_cache(maxsize=8)
+def _sgf_coord_table(board_size: int) -> np.ndarray:
+    """SGF "xy" coordinate of every intersection, indexed by flat row-major position."""
+    letters = [chr(ord("a") + i) for i in range(board_size)]
+    return np.array([x + y for y in letters for x in letters])
+
+
 def board_to_sgf(board: Optional[List[List[int]]], board_size: int = 19) -> str:
     if board is None:
         return ""
-    black_stones = []
-    white_stones = []
-    for row in range(board_size):
-        for col in range(board_size):
-            if row < len(board) and col < len(board[row]):
-                stone = board[row][col]
-                coord = chr(ord("a") + col) + chr(ord("a") + row)
-                if stone == 1:
-                    black_stones.append(coord)
-                elif stone == 2:
-                    white_stones.append(coord)
+    # Copy the (possibly partial or ragged) board onto a full-size grid, then
+    # let NumPy find the stones instead of visiting every intersection
+    grid = np.zeros((board_size, board_size), dtype=np.int64)
+    for row, values in enumerate(board[:board_size]):
+        values = values[:board_size]
+        grid[row, : len(values)] = values
+
+    # Flat indices are row-major, matching the original row-by-row scan order
+    coords = _sgf_coord_table(board_size)
+    black_stones = coords[np.flatnonzero(grid == 1)].tolist()
+    white_stones = coords[np.flatnonzero(grid == 2)].tolist()
     sgf = f"(;GM[1]FF[4]SZ[{board_size}]"
     if black_stones:
-        sgf += "AB" + "".join(f"[{s}]" for s in black_stones)
+        sgf += "AB[" + "][".join(black_stones) + "]"
     if white_stones:
-        sgf += "AW" + "".join(f"[{s}]" for s in white_stones)
+        sgf += "AW[" + "][".join(white_stones) + "]"
     sgf += ")"
     return sgf
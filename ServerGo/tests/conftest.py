@@ -1,11 +1,88 @@
+import os
 import pytest
 import sys
+import types
 from pathlib import Path
 
+from tests.helpers import JPEG_MINIMAL
+
 # Add the server directory to the path so we can import the server module
 server_path = Path(__file__).parent.parent
 sys.path.insert(0, str(server_path))
 
+# UNIVERSAL_MOCK=1 replaces the torch-backed recognizer module with a stub before
+# anything imports it. Only for modules that mock the recognizer anyway (e.g. the
+# recognition router tests); the recognizer's own tests need the real module.
+if os.environ.get("UNIVERSAL_MOCK") == "1":
+
+    class _StubUniversalGoRecognizer:
+        def __init__(self, *args, **kwargs):
+            raise RuntimeError(
+                "UniversalGoRecognizer is stubbed out (UNIVERSAL_MOCK=1)"
+            )
+
+    def _stub_board_to_sgf(board, board_size=19):
+        from services.stone_classifier import board_to_sgf
+
+        return board_to_sgf(board or [], board_size)
+
+    _stub = types.ModuleType("services.universal_go_recognizer")
+    _stub.UniversalGoRecognizer = _StubUniversalGoRecognizer
+    _stub.board_to_sgf = _stub_board_to_sgf
+    sys.modules["services.universal_go_recognizer"] = _stub
+
+# Test models run tiny batches; thread-pool fork/join costs more than it saves.
+# Must run before the first tensor op, which is why it lives at conftest import.
+try:
+    import torch
+except ImportError:
+    pass
+else:
+    torch.set_num_threads(1)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Interop pool already started (e.g. torch used by a plugin)
+        pass
+
+
+@pytest.fixture(scope="session")
+def app():
+    """FastAPI application, imported once per test session."""
+    from main import app as _app
+
+    return _app
+
+
+@pytest.fixture(scope="session")
+def test_client(app):
+    """Shared TestClient for the FastAPI application."""
+    from fastapi.testclient import TestClient
+
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def api_key_override(app):
+    """Bypass API key auth on the shared app for the requesting module.
+
+    Module-scoped rather than session-wide: several modules reset
+    ``app.dependency_overrides`` in their own teardown.
+    """
+    from middleware.auth import verify_api_key
+
+    app.dependency_overrides[verify_api_key] = lambda: "test-key"
+    yield
+    app.dependency_overrides.pop(verify_api_key, None)
+
+
+@pytest.fixture
+def stub_image_base64(monkeypatch):
+    """Skip JPEG/base64 encoding of preview and warped images in router responses."""
+    monkeypatch.setattr(
+        "routers.v1.recognitions._encode_jpeg_base64", lambda image, quality: ""
+    )
+
 
 @pytest.fixture
 def sample_sgf_content():
@@ -63,6 +140,17 @@ def mock_katago_engine():
     return engine
 
 
+@pytest.fixture
+def mock_recognizer():
+    """Mock universal recognizer that reports itself as available."""
+    from unittest.mock import MagicMock
+
+    recognizer = MagicMock()
+    recognizer.is_available.return_value = True
+
+    return recognizer
+
+
 @pytest.fixture
 def mock_recognition_service():
     """Mock recognition service for isolated testing."""
@@ -99,4 +187,4 @@ def mock_image_bytes():
         return buffer.getvalue()
     except ImportError:
         # Minimal valid JPEG if PIL not available
-        return b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+        return JPEG_MINIMAL
@@ -0,0 +1,50 @@
+"""
+Shared test helpers.
+
+Plain module rather than conftest so tests can import these without pulling
+in conftest's import-time side effects (recognizer stub, torch thread setup).
+"""
+
+# Smallest valid JPEG we use: 1x1 black grayscale, optimized Huffman tables (160 bytes).
+# Decodes with cv2.imdecode; for tests where detection is mocked and pixels don't matter.
+JPEG_MINIMAL = bytes.fromhex(
+    "ffd8ffe000104a46494600010100000100010000ffdb004300100b0c0e0c0a10"
+    "0e0d0e1211101318281a181616183123251d283a333d3c3933383740485c4e40"
+    "4457453738506d51575f626768673e4d71797064785c656763ffc0000b080001"
+    "000101011100ffc40014000100000000000000000000000000000007ffc40014"
+    "100100000000000000000000000000000000ffda0008010100003f003f7fffd9"
+)
+
+
+class FakeRecognizer:
+    """Lightweight stand-in for UniversalGoRecognizer.
+
+    Keyword arguments become attributes, so recognizer methods are passed as
+    plain callables, e.g. ``FakeRecognizer(detect_corners=lambda img: corners)``.
+    Prefer MagicMock only where call assertions are needed.
+    """
+
+    def __init__(self, _available: bool = True, **attrs):
+        self._available = _available
+        self.__dict__.update(attrs)
+
+    def is_available(self) -> bool:
+        return self._available
+
+
+def async_return(value=None, raises=None):
+    """Cheap AsyncMock replacement: a coroutine function that records its calls.
+
+    Calls are stored as ``(args, kwargs)`` tuples on ``.calls``. If ``raises`` is
+    given it is raised instead of returning ``value``.
+    """
+    calls = []
+
+    async def fake(*args, **kwargs):
+        calls.append((args, kwargs))
+        if raises is not None:
+            raise raises
+        return value
+
+    fake.calls = calls
+    return fake
@@ -0,0 +1,91 @@
+"""
+Tests for the persistent analysis cache
+"""
+
+import sqlite3
+from unittest.mock import patch
+
+from services.analysis_cache import AnalysisCache, engine_fingerprint
+
+
+class TestAnalysisCache:
+    """Test suite for AnalysisCache."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a stored analysis is returned for the same key."""
+        cache = AnalysisCache(str(tmp_path / "cache.sqlite3"))
+        key = cache.make_key("(;GM[1])", 100)
+
+        assert cache.get(key) is None
+        cache.put(key, "(;GM[1]C[Analyzed é])")
+        assert cache.get(key) == "(;GM[1]C[Analyzed é])"
+        cache.close()
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that results survive reopening the database file."""
+        path = str(tmp_path / "cache.sqlite3")
+        first = AnalysisCache(path)
+        key = first.make_key("(;GM[1])", 100)
+        first.put(key, "(;GM[1]C[Analyzed])")
+        first.close()
+
+        assert AnalysisCache(path).get(key) == "(;GM[1]C[Analyzed])"
+
+    def test_key_covers_settings(self):
+        """Test that visits, turn range and engine are part of the key."""
+        cache = AnalysisCache(":memory:", engine_id="net-a")
+        keys = {
+            cache.make_key("(;GM[1])", 100),
+            cache.make_key("(;GM[1])", 200),
+            cache.make_key("(;GM[1])", 100, start_turn=0),
+            cache.make_key("(;GM[1])", 100, end_turn=5),
+            cache.make_key("(;GM[1];B[aa])", 100),
+            AnalysisCache(":memory:", engine_id="net-b").make_key("(;GM[1])", 100),
+        }
+        assert len(keys) == 6
+        assert cache.make_key("(;GM[1])", 100) == cache.make_key("(;GM[1])", 100)
+
+    def test_expired_entries_miss(self, tmp_path):
+        """Test that entries older than the TTL are neither returned nor kept."""
+        cache = AnalysisCache(str(tmp_path / "cache.sqlite3"), ttl_sec=60)
+        with patch("services.analysis_cache.time.time", return_value=1000.0):
+            cache.put("old", "(;GM[1])")
+        with patch("services.analysis_cache.time.time", return_value=1061.0):
+            assert cache.get("old") is None
+            cache.put("new", "(;GM[1])")
+
+        rows = cache._connect().execute("SELECT key FROM analyses").fetchall()
+        assert rows == [("new",)]
+        cache.close()
+
+    def test_row_cap_evicts_oldest(self, tmp_path):
+        """Test that the table never grows past max_entries."""
+        cache = AnalysisCache(str(tmp_path / "cache.sqlite3"), max_entries=3)
+        for i in range(5):
+            with patch("services.analysis_cache.time.time", return_value=1000.0 + i):
+                cache.put(f"k{i}", "(;GM[1])")
+
+        with patch("services.analysis_cache.time.time", return_value=1005.0):
+            hits = [cache.get(f"k{i}") is not None for i in range(5)]
+        assert hits == [False, False, True, True, True]
+        cache.close()
+
+    def test_engine_fingerprint_tracks_files(self, tmp_path):
+        """Test that replacing the model file changes the engine fingerprint."""
+        model = tmp_path / "model.bin.gz"
+        model.write_bytes(b"a")
+        before = engine_fingerprint([str(model), str(tmp_path / "missing.cfg")])
+
+        model.write_bytes(b"bb")
+        after = engine_fingerprint([str(model), str(tmp_path / "missing.cfg")])
+
+        assert before != after
+
+    def test_errors_are_not_raised(self, tmp_path):
+        """Test that database failures degrade to cache misses."""
+        cache = AnalysisCache(str(tmp_path / "cache.sqlite3"))
+        with patch.object(
+            AnalysisCache, "_connect", side_effect=sqlite3.OperationalError("locked")
+        ):
+            cache.put("key", "(;GM[1])")
+            assert cache.get("key") is None
@@ -13,7 +13,6 @@ def override_auth():
     app.dependency_overrides.pop(verify_api_key, None)
 
 
-@pytest.mark.asyncio
 async def test_analysis_stream_connection():
     # Using AsyncClient for SSE endpoint testing
     transport = ASGITransport(app=app)
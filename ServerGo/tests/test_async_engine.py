@@ -19,7 +19,6 @@ def mock_engine():
         yield engine
 
 
-@pytest.mark.asyncio
 async def test_start_engine(mock_engine):
     """Test that start() calls the sync engine's start() method via asyncio.to_thread."""
     mock_engine._mock_sync.start = MagicMock()
@@ -29,14 +28,12 @@ async def test_start_engine(mock_engine):
         mock_to_thread.assert_called_once_with(mock_engine.sync_engine.start)
 
 
-@pytest.mark.asyncio
 async def test_analyze_raises_not_implemented(mock_engine):
     """Test that analyze() raises NotImplementedError as we use streaming instead."""
     with pytest.raises(NotImplementedError, match="Use analyze_streaming instead"):
         await mock_engine.analyze("(;GM[1])", visits=10)
 
 
-@pytest.mark.asyncio
 async def test_analyze_streaming_flow(mock_engine):
     """Test that analyze_streaming correctly bridges sync generator to async generator."""
     # Setup mock sync engine generator
@@ -62,7 +59,6 @@ async def test_analyze_streaming_flow(mock_engine):
     assert results[1]["winrate"] == 55.0
 
 
-@pytest.mark.asyncio
 async def test_analyze_streaming_handles_exception(mock_engine):
     """Test that exceptions in sync generator are propagated."""
 
@@ -117,6 +117,38 @@ def test_classify_cnn_edge_patches(sample_warped_board):
     assert all(len(row) == 19 for row in result)
 
 
+def test_classify_cnn_batched_transform_matches_per_patch(sample_warped_board):
+    """Test the batched preprocessing equals applying the default transform per patch."""
+    model = MagicMock(return_value=torch.zeros((361, 3)))
+    classifier = StoneClassifier(model=model, device=torch.device("cpu"), board_size=19)
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, sample_warped_board.shape, dtype=np.uint8)
+
+    classifier.classify(img, margin=16)
+    batched = model.call_args[0][0]
+
+    # A custom transform is applied patch by patch
+    classifier.transform = transforms_copy = classifier.transform.__class__(
+        classifier.transform.transforms
+    )
+    classifier.classify(img, margin=16)
+    per_patch = model.call_args[0][0]
+
+    assert transforms_copy is not classifier._default_transform
+    assert batched.shape == (361, 3, 32, 32)
+    assert torch.allclose(batched, per_patch)
+
+
+def test_grid_centers_fixed_layout():
+    """Test grid line offsets for the standard 608px / 16px-margin warp."""
+    centers = StoneClassifier._grid_centers(608, 16, 19)
+
+    assert len(centers) == 19
+    assert centers[0] == 16
+    assert centers[-1] == 592
+    assert StoneClassifier._grid_centers(608, 16, 19) is centers
+
+
 def test_classify_cnn_patch_resize():
     """Test that patches are resized when needed."""
     model = MagicMock()
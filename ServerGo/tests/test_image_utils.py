@@ -6,7 +6,6 @@ from fastapi import UploadFile, HTTPException
 from core.image_utils import decode_image
 
 
-@pytest.mark.asyncio
 async def test_decode_image_success():
     # Create a dummy image
     img = np.zeros((100, 100, 3), dtype=np.uint8)
@@ -22,7 +21,6 @@ async def test_decode_image_success():
     assert decoded.shape == (100, 100, 3)
 
 
-@pytest.mark.asyncio
 async def test_decode_image_invalid_content_type():
     mock_file = MagicMock(spec=UploadFile)
     mock_file.content_type = "text/plain"
@@ -33,7 +31,6 @@ async def test_decode_image_invalid_content_type():
     assert "image" in exc.value.detail
 
 
-@pytest.mark.asyncio
 async def test_decode_image_bad_data():
     mock_file = MagicMock(spec=UploadFile)
     mock_file.content_type = "image/png"
@@ -45,7 +42,6 @@ async def test_decode_image_bad_data():
     assert "Invalid" in exc.value.detail or "Could not decode" in exc.value.detail
 
 
-@pytest.mark.asyncio
 async def test_decode_image_exception_handling():
     # Test handling of unexpected exceptions
     mock_file = MagicMock(spec=UploadFile)
@@ -11,7 +11,6 @@ from services.katago_service import KataGoService  # noqa: E402
 from core.analysis.async_engine import AsyncKataGoEngine  # noqa: E402
 
 
-@pytest.mark.asyncio
 async def test_analyze_success():
     """Test successful analysis using mocked engine"""
     # Pass a dummy factory, we will mock the engine property directly anyway
@@ -34,7 +33,6 @@ async def test_analyze_success():
     mock_engine.analyze.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_analyze_restart_failure():
     """Test analysis when KataGo fails to start (simulated)"""
     mock_config = MagicMock()
@@ -49,7 +47,6 @@ async def test_analyze_restart_failure():
         mock_start.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_analyze_auto_restart():
     """Test that analyze attempts to start engine if not running"""
     mock_config = MagicMock()
@@ -23,7 +23,6 @@ def mock_engine():
         yield engine
 
 
-@pytest.mark.asyncio
 async def test_streaming_propagates_katago_errors(mock_engine):
     """
     Test that KataGo error responses (like 'Illegal move') are correctly
@@ -48,7 +47,6 @@ async def test_streaming_propagates_katago_errors(mock_engine):
     assert "KataGo error: Illegal move 0: D4" in str(exc_info.value)
 
 
-@pytest.mark.asyncio
 async def test_analyze_raises_not_implemented(mock_engine):
     """
     Test that analyze() raises NotImplementedError since we use streaming.
@@ -59,7 +57,6 @@ async def test_analyze_raises_not_implemented(mock_engine):
         await mock_engine.analyze("(;GM[1])", visits=10)
 
 
-@pytest.mark.asyncio
 async def test_streaming_handles_process_not_running(mock_engine):
     """
     Test that appropriate error is raised when process is not running.
@@ -66,7 +66,6 @@ def service(mock_engine, mock_config):
     return svc
 
 
-@pytest.mark.asyncio
 async def test_katago_service_lifecycle(service, mock_engine):
     # Test start
     await service.start()
@@ -83,7 +82,6 @@ async def test_katago_service_lifecycle(service, mock_engine):
     assert mock_engine.stop_called
 
 
-@pytest.mark.asyncio
 async def test_analyze_success(service):
     await service.start()
     res = await service.analyze("(;GM[1])", visits=10)
@@ -91,7 +89,6 @@ async def test_analyze_success(service):
     await service.stop()
 
 
-@pytest.mark.asyncio
 async def test_analyze_auto_restart(service, mock_engine):
     await service.start()
 
@@ -110,7 +107,6 @@ async def test_analyze_auto_restart(service, mock_engine):
     await service.stop()  # Cleanup
 
 
-@pytest.mark.asyncio
 async def test_analyze_stream(service):
     await service.start()
     results = []
@@ -121,7 +117,6 @@ async def test_analyze_stream(service):
     await service.stop()
 
 
-@pytest.mark.asyncio
 async def test_watchdog_restart(service, mock_engine):
     # This is tricky because watchdog runs in background loop.
     # We can simulate the loop logic manually or wait for it.
@@ -145,7 +140,6 @@ async def test_watchdog_restart(service, mock_engine):
     await service.stop()
 
 
-@pytest.mark.asyncio
 async def test_start_failure(service):
     service.engine_factory.side_effect = RuntimeError("Fail start")
 
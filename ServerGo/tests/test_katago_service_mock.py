@@ -1,5 +1,3 @@
-import pytest
-
 from unittest.mock import MagicMock
 from services.katago_service import KataGoService
 
@@ -27,7 +25,6 @@ class MockGoEngine:
         return self.running
 
 
-@pytest.mark.asyncio
 async def test_katago_service_with_mock_engine():
     # Arrange
     # Arrange
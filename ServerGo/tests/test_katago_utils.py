@@ -1,9 +1,9 @@
 from core.analysis.katago_utils import construct_katago_query, process_analysis_results
 from core.sgf.parser import SGF
 
-# Sample SGF for testing
+# Sample SGF for testing (bytes, exercising the parser's bytes input path)
 SAMPLE_SGF = (
-    "(;GM[1]SZ[19]KM[6.5]RU[Japanese]PB[Black]PW[White];B[pd];W[dp];B[pq];W[dd])"
+    b"(;GM[1]SZ[19]KM[6.5]RU[Japanese]PB[Black]PW[White];B[pd];W[dp];B[pq];W[dd])"
 )
 
 
@@ -10,7 +10,13 @@ with (
     patch("main.katago_service"),
     patch("main.init_recognizer"),
 ):
-    from main import app, lifespan
+    from main import (
+        app,
+        lifespan,
+        app_exception_handler,
+        http_exception_handler,
+        unhandled_exception_handler,
+    )
 
 
 @pytest.fixture
@@ -19,7 +25,6 @@ def test_client():
     return TestClient(app)
 
 
-@pytest.mark.asyncio
 async def test_lifespan_katago_configured():
     """Test lifespan with KataGo configured."""
     mock_app = MagicMock()
@@ -43,7 +48,6 @@ async def test_lifespan_katago_configured():
         mock_katago.stop.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_lifespan_katago_not_configured():
     """Test lifespan when KataGo is not configured."""
     mock_app = MagicMock()
@@ -80,11 +84,8 @@ def test_request_id_middleware(test_client):
     assert len(response.headers["X-Request-ID"]) > 0
 
 
-@pytest.mark.asyncio
 async def test_app_exception_handler():
     """Test AppException is handled correctly."""
-    from main import app_exception_handler
-
     mock_request = MagicMock()
     mock_request.state.request_id = "test-request-id"
 
@@ -98,11 +99,8 @@ async def test_app_exception_handler():
     assert "Test detail" in body
 
 
-@pytest.mark.asyncio
 async def test_http_exception_handler():
     """Test HTTPException is handled correctly."""
-    from main import http_exception_handler
-
     mock_request = MagicMock()
     mock_request.state.request_id = "test-request-id"
 
@@ -115,11 +113,8 @@ async def test_http_exception_handler():
     assert "Not found" in body
 
 
-@pytest.mark.asyncio
 async def test_unhandled_exception_handler():
     """Test unhandled exceptions are caught."""
-    from main import unhandled_exception_handler
-
     mock_request = MagicMock()
     mock_request.state.request_id = "test-request-id"
 
@@ -147,8 +147,7 @@ def test_cleanup_removes_stale_buckets(mock_request):
     assert identifier not in limiter.buckets
 
 
-@pytest.mark.asyncio
-async def test_middleware_init():
+def test_middleware_init():
     """Test middleware initialization."""
     app = MagicMock()
     middleware = RateLimiterMiddleware(app, max_requests=100, window_seconds=60)
@@ -157,7 +156,6 @@ async def test_middleware_init():
     assert middleware.limiter.window_seconds == 60
 
 
-@pytest.mark.asyncio
 async def test_middleware_skips_health_checks():
     """Test middleware skips rate limiting for health endpoints."""
     app = MagicMock()
@@ -174,7 +172,6 @@ async def test_middleware_skips_health_checks():
     call_next.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_middleware_allows_request_under_limit():
     """Test middleware allows requests under limit."""
     app = MagicMock()
@@ -195,7 +192,6 @@ async def test_middleware_allows_request_under_limit():
     assert result == "response"
 
 
-@pytest.mark.asyncio
 async def test_middleware_blocks_request_over_limit():
     """Test middleware blocks requests exceeding limit."""
     app = MagicMock()
@@ -223,7 +219,6 @@ async def test_middleware_blocks_request_over_limit():
     assert "Retry-After" in result.headers
 
 
-@pytest.mark.asyncio
 async def test_middleware_skip_ping_endpoint():
     """Test middleware skips /ping endpoint."""
     app = MagicMock()
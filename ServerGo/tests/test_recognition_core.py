@@ -6,6 +6,10 @@ from core.recognition.warp import warp_board
 from core.recognition.classifier import StoneClassifier
 import torch
 
+# Shared 19x19 classifier results (built row-by-row so inner lists are not aliased)
+_GRID_ONES = [[1] * 19 for _ in range(19)]
+_GRID_TWOS = [[2] * 19 for _ in range(19)]
+
 
 @pytest.fixture
 def mock_model():
@@ -98,21 +102,30 @@ def test_stone_classifier(mock_load):
 
 def test_stone_classifier_fallback(mock_model):
     # Test fallback logic: CNN fail -> Adaptive
-    classifier = StoneClassifier(model=mock_model)
-    classifier._classify_cnn = MagicMock(side_effect=Exception("CNN Error"))
-    classifier._classify_adaptive = MagicMock(return_value=[[1] * 19] * 19)
-
-    res = classifier.classify(np.zeros((100, 100, 3), np.uint8))
-    assert res[0][0] == 1
-    classifier._classify_adaptive.assert_called_once()
-
-    # Test fallback: CNN -> Adaptive Fail -> Heuristic
-    classifier._classify_adaptive.side_effect = Exception("Adaptive Error")
-    classifier._classify_heuristic = MagicMock(return_value=[[2] * 19] * 19)
-
-    res = classifier.classify(np.zeros((100, 100, 3), np.uint8))
-    assert res[0][0] == 2
-    classifier._classify_heuristic.assert_called_once()
+    # Patch at class level before instantiation so the CNN path is never set up
+    with (
+        patch.object(
+            StoneClassifier, "_classify_cnn", side_effect=Exception("CNN Error")
+        ),
+        patch.object(
+            StoneClassifier, "_classify_adaptive", return_value=_GRID_ONES
+        ) as mock_adaptive,
+        patch.object(
+            StoneClassifier, "_classify_heuristic", return_value=_GRID_TWOS
+        ) as mock_heuristic,
+    ):
+        classifier = StoneClassifier(model=mock_model)
+
+        res = classifier.classify(np.zeros((100, 100, 3), np.uint8))
+        assert res[0][0] == 1
+        mock_adaptive.assert_called_once()
+
+        # Test fallback: CNN -> Adaptive Fail -> Heuristic
+        mock_adaptive.side_effect = Exception("Adaptive Error")
+
+        res = classifier.classify(np.zeros((100, 100, 3), np.uint8))
+        assert res[0][0] == 2
+        mock_heuristic.assert_called_once()
 
 
 def test_heuristic_classification():
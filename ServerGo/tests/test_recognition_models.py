@@ -1,7 +1,38 @@
+import warnings
+
+import pytest
 import torch
 import torch.nn as nn
 from core.recognition.models import ResNet9, conv_block
 
+# Shape-only tests don't depend on input values; allocate inputs once per module.
+# NHWC (channels_last) matches the shared model and lets oneDNN use its fast conv kernels.
+_INPUT_32 = torch.zeros(16, 3, 32, 32).contiguous(memory_format=torch.channels_last)
+_INPUTS_BY_SIZE = {
+    size: torch.zeros(1, 3, size, size).contiguous(memory_format=torch.channels_last)
+    for size in (32, 40, 48, 64, 128)
+}
+
+
+@pytest.fixture(scope="module")
+def default_model():
+    """Shared eval-mode, channels_last ResNet9(3, 3); tests must not mutate it."""
+    model = ResNet9(in_channels=3, num_classes=3)
+    model.eval()
+    return model.to(memory_format=torch.channels_last)
+
+
+@pytest.fixture(scope="module")
+def default_model_scripted(default_model):
+    """TorchScript build of the shared model for forward-only tests.
+
+    Tests that introspect submodules (conv1, res1, ...) keep the eager model.
+    """
+    with warnings.catch_warnings():
+        # torch.jit.script is deprecated in newer torch but still supported
+        warnings.simplefilter("ignore", FutureWarning)
+        return torch.jit.script(default_model).eval()
+
 
 def test_conv_block_without_pool():
     """Test conv_block function without pooling."""
@@ -45,29 +76,29 @@ def test_resnet9_initialization():
     assert hasattr(model, "classifier")
 
 
-def test_resnet9_forward_pass():
+def test_resnet9_forward_pass(default_model_scripted):
     """Test ResNet9 forward pass with dummy input."""
-    model = ResNet9(in_channels=3, num_classes=3)
-    model.eval()
+    model = default_model_scripted
 
     # Create dummy input: batch of 4 images, 3 channels, 32x32
     batch_size = 4
     input_tensor = torch.randn(batch_size, 3, 32, 32)
 
     # Forward pass
-    output = model(input_tensor)
+    with torch.inference_mode():
+        output = model(input_tensor)
 
     # Output should be [batch_size, num_classes]
     assert output.shape == (batch_size, 3)
 
 
-def test_resnet9_output_range():
+def test_resnet9_output_range(default_model_scripted):
     """Test that ResNet9 produces logits (not probabilities)."""
-    model = ResNet9(in_channels=3, num_classes=3)
-    model.eval()
+    model = default_model_scripted
 
     input_tensor = torch.randn(1, 3, 32, 32)
-    output = model(input_tensor)
+    with torch.inference_mode():
+        output = model(input_tensor)
 
     # Output should be logits (can be >1 or <0)
     # Just verify it's a valid tensor
@@ -76,58 +107,50 @@ def test_resnet9_output_range():
     assert not torch.isinf(output).any()
 
 
-def test_resnet9_different_input_sizes():
-    """Test ResNet9 with different input sizes."""
-    model = ResNet9(in_channels=3, num_classes=3)
-    model.eval()
-
-    # Test with 48x48 input
-    input_48 = torch.randn(1, 3, 48, 48)
-    output_48 = model(input_48)
-    assert output_48.shape == (1, 3)
-
-    # Test with 64x64 input
-    input_64 = torch.randn(1, 3, 64, 64)
-    output_64 = model(input_64)
-    assert output_64.shape == (1, 3)
+@pytest.mark.parametrize("size", sorted(_INPUTS_BY_SIZE))
+def test_resnet9_forward_size(default_model_scripted, size):
+    """Test that adaptive pooling handles various input sizes."""
+    with torch.inference_mode():
+        output = default_model_scripted(_INPUTS_BY_SIZE[size])
+    assert output.shape == (1, 3)
 
 
-def test_resnet9_batch_processing():
+def test_resnet9_batch_processing(default_model_scripted):
     """Test ResNet9 with various batch sizes."""
-    model = ResNet9(in_channels=3, num_classes=3)
-    model.eval()
+    model = default_model_scripted
 
-    # Batch of 1
-    output_1 = model(torch.randn(1, 3, 32, 32))
-    assert output_1.shape == (1, 3)
+    with torch.inference_mode():
+        # Batch of 1
+        output_1 = model(_INPUT_32[:1])
+        assert output_1.shape == (1, 3)
 
-    # Batch of 8
-    output_8 = model(torch.randn(8, 3, 32, 32))
-    assert output_8.shape == (8, 3)
+        # Batch of 8
+        output_8 = model(_INPUT_32[:8])
+        assert output_8.shape == (8, 3)
 
-    # Batch of 16
-    output_16 = model(torch.randn(16, 3, 32, 32))
-    assert output_16.shape == (16, 3)
+        # Batch of 16
+        output_16 = model(_INPUT_32)
+        assert output_16.shape == (16, 3)
 
 
-def test_resnet9_residual_connections():
+def test_resnet9_residual_connections(default_model):
     """Test that residual connections work."""
-    model = ResNet9(in_channels=3, num_classes=3)
-    model.eval()
+    model = default_model
 
     input_tensor = torch.randn(2, 3, 32, 32)
 
-    # Process through conv1 and conv2
-    out = model.conv1(input_tensor)
-    out = model.conv2(out)
+    with torch.inference_mode():
+        # Process through conv1 and conv2
+        out = model.conv1(input_tensor)
+        out = model.conv2(out)
 
-    # Residual block should add input
-    res1_input = out.clone()
-    res1_output = model.res1(out)
-    final = res1_output + res1_input
+        # Residual block should add input
+        res1_input = out.clone()
+        res1_output = model.res1(out)
+        final = res1_output + res1_input
 
-    # Should be different from just res1_output
-    assert not torch.allclose(final, res1_output)
+    # The skip path contributes exactly the block input
+    assert torch.allclose(final - res1_output, res1_input, atol=1e-5)
 
 
 def test_resnet9_custom_channels():
@@ -158,31 +181,31 @@ def test_resnet9_custom_classes():
 
 def test_resnet9_gradients():
     """Test that ResNet9 supports gradient computation."""
-    model = ResNet9(in_channels=3, num_classes=3)
-    model.train()
+    # Eval mode leaves BatchNorm running stats untouched; frozen parameters
+    # restrict backward to the input path, which is all this test checks.
+    model = ResNet9(in_channels=3, num_classes=3).eval().requires_grad_(False)
 
-    input_tensor = torch.randn(2, 3, 32, 32, requires_grad=True)
+    input_tensor = torch.randn(1, 3, 32, 32, requires_grad=True)
     output = model(input_tensor)
 
     # Compute dummy loss and backprop
-    loss = output.sum()
-    loss.backward()
+    output.sum().backward()
 
     # Gradients should exist
     assert input_tensor.grad is not None
 
 
-def test_resnet9_deterministic():
+def test_resnet9_deterministic(default_model_scripted):
     """Test that ResNet9 produces same output for same input in eval mode."""
-    model = ResNet9(in_channels=3, num_classes=3)
-    model.eval()
+    model = default_model_scripted
 
     input_tensor = torch.randn(1, 3, 32, 32)
 
-    output1 = model(input_tensor)
-    output2 = model(input_tensor)
+    with torch.inference_mode():
+        output1 = model(input_tensor)
+        output2 = model(input_tensor)
 
-    assert torch.allclose(output1, output2)
+    assert torch.equal(output1, output2)
 
 
 def test_conv_block_conv_params():
@@ -194,15 +217,3 @@ def test_conv_block_conv_params():
     assert conv_layer.padding == (1, 1)
     assert conv_layer.in_channels == 32
     assert conv_layer.out_channels == 64
-
-
-def test_resnet9_adaptive_pooling():
-    """Test that adaptive pooling works for various input sizes."""
-    model = ResNet9(in_channels=3, num_classes=3)
-    model.eval()
-
-    # Different input sizes should all work
-    for size in [32, 40, 48, 64, 128]:
-        input_tensor = torch.randn(1, 3, size, size)
-        output = model(input_tensor)
-        assert output.shape == (1, 3)
@@ -1,3 +1,4 @@
+import base64
 import io
 import pytest
 
@@ -7,35 +8,26 @@ pytest.importorskip("cv2", reason="OpenCV not installed")
 import cv2  # noqa: E402
 import numpy as np  # noqa: E402
 from unittest.mock import MagicMock, patch  # noqa: E402
-from fastapi.testclient import TestClient  # noqa: E402
 
-from main import app  # noqa: E402
-from middleware.auth import verify_api_key  # noqa: E402
+# Bound at import, before stub_image_base64 swaps the module attribute
+from routers.v1.recognitions import _encode_jpeg_base64  # noqa: E402
 
+pytestmark = pytest.mark.usefixtures("api_key_override", "stub_image_base64")
 
-# Setup auth override at module level
-@pytest.fixture(scope="module", autouse=True)
-def setup_auth():
-    """Setup auth override for this test module."""
-    app.dependency_overrides[verify_api_key] = lambda: "valid-key"
-    yield
-    # Cleanup
-    if verify_api_key in app.dependency_overrides:
-        del app.dependency_overrides[verify_api_key]
 
-
-@pytest.fixture(scope="module")
-def test_client():
-    """Test client with auth override."""
-    return TestClient(app)
+# 100x100 green image, JPEG-encoded once per module
+_GREEN_IMAGE = np.full((100, 100, 3), (0, 255, 0), dtype=np.uint8)
+_JPEG_BYTES = cv2.imencode(".jpg", _GREEN_IMAGE)[1].tobytes()
 
 
 def create_valid_image():
-    # 100x100 green image
-    img = np.zeros((100, 100, 3), dtype=np.uint8)
-    img[:] = (0, 255, 0)
-    _, buf = cv2.imencode(".jpg", img)
-    return io.BytesIO(buf.tobytes())
+    return io.BytesIO(_JPEG_BYTES)
+
+
+def test_encode_jpeg_base64_produces_jpeg():
+    encoded = _encode_jpeg_base64(_GREEN_IMAGE, 85)
+
+    assert base64.b64decode(encoded).startswith(b"\xff\xd8")
 
 
 @patch("routers.v1.recognitions.get_universal_recognizer")
@@ -3,69 +3,40 @@ import numpy as np
 import cv2
 import json
 from io import BytesIO
-from fastapi.testclient import TestClient
 from unittest.mock import MagicMock, patch
 
-from main import app
-from middleware.auth import verify_api_key
+pytestmark = pytest.mark.usefixtures("api_key_override", "stub_image_base64")
 
 
-# Use session-scoped fixture to set auth override once and preserve it
-@pytest.fixture(scope="session", autouse=True)
-def setup_auth_override():
-    """Setup auth override for the entire test session."""
-
-    def mock_verify_api_key():
-        return "test-key"
-
-    # Store original overrides
-    original_overrides = app.dependency_overrides.copy()
-
-    # Set our override
-    app.dependency_overrides[verify_api_key] = mock_verify_api_key
-
-    yield
-
-    # Restore original overrides
-    app.dependency_overrides.clear()
-    app.dependency_overrides.update(original_overrides)
-
-
-@pytest.fixture(scope="module")
-def test_client():
-    """Create test client."""
+def _encode_mock_image() -> bytes:
+    # Pixel content is never inspected (recognizers are mocked), so keep it small
+    img = np.zeros((64, 64, 3), dtype=np.uint8)
+    cv2.rectangle(img, (5, 5), (55, 55), (255, 255, 255), -1)
+    _, buffer = cv2.imencode(".jpg", img)
+    return buffer.tobytes()
 
-    # Re-apply auth override in case it was cleared
-    def mock_verify_api_key():
-        return "test-key"
 
-    app.dependency_overrides[verify_api_key] = mock_verify_api_key
-    return TestClient(app)
+# JPEG-encode once per module; each test gets a fresh stream over the same bytes
+_CACHED_BYTES = _encode_mock_image()
 
 
 @pytest.fixture
 def mock_image():
     """Create a mock image file."""
-    img = np.zeros((400, 400, 3), dtype=np.uint8)
-    cv2.rectangle(img, (50, 50), (350, 350), (255, 255, 255), -1)
-    _, buffer = cv2.imencode(".jpg", img)
-    return BytesIO(buffer.tobytes())
+    return BytesIO(_CACHED_BYTES)
 
 
-def test_recognize_board_ml_success(test_client, mock_image):
+def test_recognize_board_ml_success(test_client, mock_image, mock_recognizer):
     """Test recognition with ML (universal recognizer) succeeding."""
     with (
         patch("routers.v1.recognitions.get_universal_recognizer") as mock_get_univ,
         patch("routers.v1.recognitions.UNIVERSAL_AVAILABLE", True),
     ):
-        mock_recognizer = MagicMock()
-        mock_recognizer.is_available.return_value = True
-
         board = [[0] * 19 for _ in range(19)]
         board[3][3] = 1
         board[15][15] = 2
         corners = [[50, 50], [350, 50], [350, 350], [50, 350]]
-        warped = np.zeros((608, 608, 3), dtype=np.uint8)
+        warped = np.zeros((64, 64, 3), dtype=np.uint8)
 
         mock_recognizer.recognize_board.return_value = (warped, board, corners)
         mock_get_univ.return_value = mock_recognizer
@@ -83,20 +54,20 @@ def test_recognize_board_ml_success(test_client, mock_image):
         assert data["data"]["whiteStones"] == 1
 
 
-def test_recognize_board_ml_fails_fallback_opencv(test_client, mock_image):
+def test_recognize_board_ml_fails_fallback_opencv(
+    test_client, mock_image, mock_recognizer
+):
     """Test ML failing, falling back to OpenCV."""
     with (
         patch("routers.v1.recognitions.get_universal_recognizer") as mock_get_univ,
         patch("routers.v1.recognitions.BoardDetector") as mock_detector_cls,
         patch("routers.v1.recognitions.StoneClassifier") as mock_classifier_cls,
     ):
-        mock_recognizer = MagicMock()
-        mock_recognizer.is_available.return_value = True
         mock_recognizer.recognize_board.side_effect = Exception("ML Error")
         mock_get_univ.return_value = mock_recognizer
 
         mock_detector = MagicMock()
-        warped = np.zeros((608, 608, 3), dtype=np.uint8)
+        warped = np.zeros((64, 64, 3), dtype=np.uint8)
         mock_detector.detect_board.return_value = warped
         mock_detector.extract_grid_cells.return_value = [np.zeros((32, 32, 3))] * 361
         mock_detector_cls.return_value = mock_detector
@@ -140,11 +111,9 @@ def test_recognize_board_detection_fails(test_client, mock_image):
         assert "Board detection failed" in str(resp_data)
 
 
-def test_detect_corners_only_ml_success(test_client, mock_image):
+def test_detect_corners_only_ml_success(test_client, mock_image, mock_recognizer):
     """Test corners endpoint with ML."""
     with patch("routers.v1.recognitions.get_universal_recognizer") as mock_get_univ:
-        mock_recognizer = MagicMock()
-        mock_recognizer.is_available.return_value = True
         corners = np.array(
             [[50, 50], [350, 50], [350, 350], [50, 350]], dtype=np.float32
         )
@@ -162,14 +131,11 @@ def test_detect_corners_only_ml_success(test_client, mock_image):
         assert "previewBase64" in data["data"]
 
 
-def test_classify_with_corners_resnet9(test_client, mock_image):
+def test_classify_with_corners_resnet9(test_client, mock_image, mock_recognizer):
     """Test classify endpoint with ResNet9 classifier."""
     corners_json = json.dumps([[50, 50], [350, 50], [350, 350], [50, 350]])
 
     with patch("routers.v1.recognitions.get_universal_recognizer") as mock_get_univ:
-        mock_recognizer = MagicMock()
-        mock_recognizer.is_available.return_value = True
-
         mock_classifier = MagicMock()
         board = [[0] * 19 for _ in range(19)]
         board[5][5] = 1
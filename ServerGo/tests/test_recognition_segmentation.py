@@ -4,6 +4,11 @@ import torch
 from unittest.mock import MagicMock, patch
 from core.recognition.segmentation import predict_mask, cleanup_mask
 
+# Deterministic 0/255 stripe mask; cleanup tests only check shape and binarization
+_STRIPED_MASK_520 = ((np.arange(520 * 520) & 1).astype(np.uint8) * 255).reshape(
+    520, 520
+)
+
 
 @pytest.fixture
 def mock_model():
@@ -18,8 +23,8 @@ def mock_model():
 @pytest.fixture
 def sample_image():
     """Create a sample RGB image."""
-    # 640x480 RGB image
-    return np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    # 640x480 RGB image (content is irrelevant, the model is mocked)
+    return np.zeros((480, 640, 3), dtype=np.uint8)
 
 
 def test_predict_mask_shape(mock_model, sample_image):
@@ -72,7 +77,7 @@ def test_predict_mask_various_image_sizes(mock_model):
 
     # Test different sizes - should all resize to 520x520
     for size in [(480, 640, 3), (800, 600, 3), (1024, 768, 3)]:
-        image = np.random.randint(0, 255, size, dtype=np.uint8)
+        image = np.zeros(size, dtype=np.uint8)
         mask = predict_mask(mock_model, image, device)
         assert mask.shape == (520, 520)
 
@@ -84,8 +89,8 @@ def test_predict_mask_averaging():
 
     # Create predictable outputs
     output_shape = (1, 520, 520)
-    output1 = torch.ones(output_shape) * 2.0  # High logits
-    output2 = torch.ones(output_shape) * 2.0  # Same for flipped
+    output1 = torch.full(output_shape, 2.0)  # High logits
+    output2 = output1  # Same for flipped (read-only, safe to share)
 
     model.side_effect = [
         {"out": [output1]},  # Original
@@ -93,7 +98,7 @@ def test_predict_mask_averaging():
     ]
 
     device = torch.device("cpu")
-    image = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
 
     mask = predict_mask(model, image, device)
 
@@ -104,7 +109,7 @@ def test_predict_mask_averaging():
 def test_cleanup_mask_shape():
     """Test cleanup_mask resizes to target size."""
     # Create a 520x520 mask
-    mask = np.random.randint(0, 2, (520, 520), dtype=np.uint8) * 255
+    mask = _STRIPED_MASK_520.copy()
     target_size = (640, 480)
 
     cleaned = cleanup_mask(mask, target_size)
@@ -115,7 +120,7 @@ def test_cleanup_mask_shape():
 
 def test_cleanup_mask_binary():
     """Test cleanup_mask returns binary values."""
-    mask = np.random.randint(0, 2, (520, 520), dtype=np.uint8) * 255
+    mask = _STRIPED_MASK_520.copy()
     target_size = (640, 480)
 
     cleaned = cleanup_mask(mask, target_size)
@@ -203,7 +208,7 @@ def test_predict_mask_normalization():
 
 def test_cleanup_mask_different_target_sizes():
     """Test cleanup_mask with various target sizes."""
-    mask = np.random.randint(0, 2, (520, 520), dtype=np.uint8) * 255
+    mask = _STRIPED_MASK_520.copy()
 
     for target_size in [(320, 240), (640, 480), (800, 600), (1024, 768)]:
         cleaned = cleanup_mask(mask, target_size)
@@ -229,7 +234,12 @@ def test_cleanup_mask_kernel_size():
     mask = np.ones((520, 520), dtype=np.uint8) * 255
     target_size = (520, 520)
 
-    with patch("cv2.getStructuringElement") as mock_kernel:
+    # Morphology itself is irrelevant here; pass masks through unchanged
+    with (
+        patch("cv2.getStructuringElement") as mock_kernel,
+        patch("cv2.erode", side_effect=lambda m, *a, **k: m),
+        patch("cv2.dilate", side_effect=lambda m, *a, **k: m),
+    ):
         mock_kernel.return_value = np.ones((5, 5), dtype=np.uint8)
 
         cleanup_mask(mask, target_size)
@@ -1,19 +1,31 @@
 import pytest
 import numpy as np
-import cv2
 from unittest.mock import MagicMock, patch
 from services.recognition_service import (
     RecognitionService,
     RecognitionResult,
     get_recognition_service,
 )
+from tests.helpers import JPEG_MINIMAL, FakeRecognizer
 
+# Warped board returned by the fake recognizer; read-only so no test can mutate it
+_BLANK_WARPED = np.zeros((608, 608, 3), dtype=np.uint8)
+_BLANK_WARPED.setflags(write=False)
+_BOARD_ZEROS = [[0] * 19 for _ in range(19)]
 
-@pytest.mark.asyncio
-async def test_initialize():
-    """Test service initialization."""
-    service = RecognitionService()
+_SVC = RecognitionService()
+
+
+@pytest.fixture
+def service():
+    """Shared RecognitionService, reset to its freshly constructed state."""
+    _SVC._recognizer = None
+    _SVC._initialized = False
+    return _SVC
 
+
+async def test_initialize(service):
+    """Test service initialization."""
     with patch("services.recognition_service.UniversalGoRecognizer") as mock_class:
         mock_instance = MagicMock()
         mock_class.return_value = mock_instance
@@ -24,12 +36,10 @@ async def test_initialize():
         assert service._recognizer is not None
 
 
-@pytest.mark.asyncio
-async def test_initialize_idempotent():
+async def test_initialize_idempotent(service):
     """Test that initialize can be called multiple times safely."""
-    service = RecognitionService()
     service._initialized = True
-    service._recognizer = MagicMock()
+    service._recognizer = FakeRecognizer()
 
     original_recognizer = service._recognizer
 
@@ -39,103 +49,68 @@ async def test_initialize_idempotent():
     assert service._recognizer == original_recognizer
 
 
-def test_is_available_true():
+def test_is_available_true(service):
     """Test is_available when recognizer is loaded."""
-    service = RecognitionService()
-    mock_recognizer = MagicMock()
-    mock_recognizer.is_available.return_value = True
-    service._recognizer = mock_recognizer
+    service._recognizer = FakeRecognizer(_available=True)
 
     assert service.is_available()
 
 
-def test_is_available_false_no_recognizer():
+def test_is_available_false_no_recognizer(service):
     """Test is_available when recognizer is None."""
-    service = RecognitionService()
     service._recognizer = None
 
     assert not service.is_available()
 
 
-def test_is_available_false_not_available():
+def test_is_available_false_not_available(service):
     """Test is_available when recognizer not available."""
-    service = RecognitionService()
-    mock_recognizer = MagicMock()
-    mock_recognizer.is_available.return_value = False
-    service._recognizer = mock_recognizer
+    service._recognizer = FakeRecognizer(_available=False)
 
     assert not service.is_available()
 
 
-@pytest.mark.asyncio
-async def test_detect_corners_not_available():
+async def test_detect_corners_not_available(service):
     """Test detect_corners raises error when not available."""
-    service = RecognitionService()
     service._recognizer = None
 
     with pytest.raises(RuntimeError, match="Recognition models not loaded"):
         await service.detect_corners(b"fake image")
 
 
-@pytest.mark.asyncio
-async def test_detect_corners_invalid_image():
+async def test_detect_corners_invalid_image(service):
     """Test detect_corners with invalid image data."""
-    service = RecognitionService()
-    mock_recognizer = MagicMock()
-    mock_recognizer.is_available.return_value = True
-    service._recognizer = mock_recognizer
+    service._recognizer = FakeRecognizer()
 
     with pytest.raises(ValueError, match="Failed to decode image"):
         await service.detect_corners(b"invalid")
 
 
-@pytest.mark.asyncio
-async def test_detect_corners_success():
+async def test_detect_corners_success(service):
     """Test successful corner detection."""
-    service = RecognitionService()
-    mock_recognizer = MagicMock()
-    mock_recognizer.is_available.return_value = True
-
-    # Create valid image bytes
-    img = np.zeros((400, 400, 3), dtype=np.uint8)
-    _, buffer = cv2.imencode(".jpg", img)
-    image_bytes = buffer.tobytes()
-
     corners_np = np.array(
         [[50, 50], [350, 50], [350, 350], [50, 350]], dtype=np.float32
     )
-    mock_recognizer.detect_corners.return_value = corners_np
-    service._recognizer = mock_recognizer
+    service._recognizer = FakeRecognizer(detect_corners=lambda _img: corners_np)
 
-    result = await service.detect_corners(image_bytes)
+    result = await service.detect_corners(JPEG_MINIMAL)
 
     assert result is not None
     assert len(result) == 4
     assert result[0] == [50, 50]
 
 
-@pytest.mark.asyncio
-async def test_detect_corners_none():
+async def test_detect_corners_none(service):
     """Test detect_corners when detection fails."""
-    service = RecognitionService()
-    mock_recognizer = MagicMock()
-    mock_recognizer.is_available.return_value = True
-    mock_recognizer.detect_corners.return_value = None
-    service._recognizer = mock_recognizer
+    service._recognizer = FakeRecognizer(detect_corners=lambda _img: None)
 
-    img = np.zeros((400, 400, 3), dtype=np.uint8)
-    _, buffer = cv2.imencode(".jpg", img)
-    image_bytes = buffer.tobytes()
-
-    result = await service.detect_corners(image_bytes)
+    result = await service.detect_corners(JPEG_MINIMAL)
 
     assert result is None
 
 
-@pytest.mark.asyncio
-async def test_classify_from_corners_not_available():
+async def test_classify_from_corners_not_available(service):
     """Test classify_from_corners raises error when not available."""
-    service = RecognitionService()
     service._recognizer = None
 
     with pytest.raises(RuntimeError, match="Recognition models not loaded"):
@@ -144,26 +119,17 @@ async def test_classify_from_corners_not_available():
         )
 
 
-@pytest.mark.asyncio
-async def test_classify_from_corners_success():
+async def test_classify_from_corners_success(service):
     """Test successful classification from corners."""
-    service = RecognitionService()
-    mock_recognizer = MagicMock()
-    mock_recognizer.is_available.return_value = True
-
-    img = np.zeros((400, 400, 3), dtype=np.uint8)
-    _, buffer = cv2.imencode(".jpg", img)
-    image_bytes = buffer.tobytes()
-
     board = [[0] * 19 for _ in range(19)]
     board[3][3] = 1
-    warped = np.zeros((608, 608, 3), dtype=np.uint8)
 
-    mock_recognizer.classify_from_corners.return_value = (board, warped)
-    service._recognizer = mock_recognizer
+    service._recognizer = FakeRecognizer(
+        classify_from_corners=lambda *_args: (board, _BLANK_WARPED)
+    )
 
     corners = [[50, 50], [350, 50], [350, 350], [50, 350]]
-    result = await service.classify_from_corners(image_bytes, corners)
+    result = await service.classify_from_corners(JPEG_MINIMAL, corners)
 
     assert isinstance(result, RecognitionResult)
     assert result.board[3][3] == 1
@@ -171,48 +137,27 @@ async def test_classify_from_corners_success():
     assert result.warped_base64 is not None
 
 
-@pytest.mark.asyncio
-async def test_full_recognition_success():
+async def test_full_recognition_success(service):
     """Test full recognition pipeline."""
-    service = RecognitionService()
-    mock_recognizer = MagicMock()
-    mock_recognizer.is_available.return_value = True
-
-    img = np.zeros((400, 400, 3), dtype=np.uint8)
-    _, buffer = cv2.imencode(".jpg", img)
-    image_bytes = buffer.tobytes()
-
     corners_np = np.array(
         [[50, 50], [350, 50], [350, 350], [50, 350]], dtype=np.float32
     )
-    mock_recognizer.detect_corners.return_value = corners_np
-
-    board = [[0] * 19 for _ in range(19)]
-    warped = np.zeros((608, 608, 3), dtype=np.uint8)
-    mock_recognizer.classify_from_corners.return_value = (board, warped)
-
-    service._recognizer = mock_recognizer
+    service._recognizer = FakeRecognizer(
+        detect_corners=lambda _img: corners_np,
+        classify_from_corners=lambda *_args: (_BOARD_ZEROS, _BLANK_WARPED),
+    )
 
-    result = await service.full_recognition(image_bytes)
+    result = await service.full_recognition(JPEG_MINIMAL)
 
     assert result is not None
     assert isinstance(result, RecognitionResult)
 
 
-@pytest.mark.asyncio
-async def test_full_recognition_no_corners():
+async def test_full_recognition_no_corners(service):
     """Test full recognition when corner detection fails."""
-    service = RecognitionService()
-    mock_recognizer = MagicMock()
-    mock_recognizer.is_available.return_value = True
-    mock_recognizer.detect_corners.return_value = None
-    service._recognizer = mock_recognizer
-
-    img = np.zeros((400, 400, 3), dtype=np.uint8)
-    _, buffer = cv2.imencode(".jpg", img)
-    image_bytes = buffer.tobytes()
+    service._recognizer = FakeRecognizer(detect_corners=lambda _img: None)
 
-    result = await service.full_recognition(image_bytes)
+    result = await service.full_recognition(JPEG_MINIMAL)
 
     assert result is None
 
@@ -1,12 +1,18 @@
 import pytest
 import base64
 import sys
-from unittest.mock import MagicMock, patch, AsyncMock
-
-# Mock runpod before serverless.handler imports it
-sys.modules["runpod"] = MagicMock()
-sys.modules["runpod.serverless"] = MagicMock()
-
+import types
+from unittest.mock import create_autospec, patch
+
+# Stub runpod before serverless.handler imports it; only serverless.start is used
+_runpod = types.ModuleType("runpod")
+_runpod_serverless = types.ModuleType("runpod.serverless")
+_runpod_serverless.start = lambda *args, **kwargs: None
+_runpod.serverless = _runpod_serverless
+sys.modules["runpod"] = _runpod
+sys.modules["runpod.serverless"] = _runpod_serverless
+
+from serverless import handler as _h  # noqa: E402
 from serverless.handler import (  # noqa: E402
     validate_api_key,
     error_response,
@@ -17,87 +23,76 @@ from serverless.handler import (  # noqa: E402
     AnalysisRequest,
     RecognitionRequest,
 )
-from services.recognition_service import RecognitionResult  # noqa: E402
+from services.katago_service import KataGoService  # noqa: E402
+from services.recognition_service import RecognitionResult, RecognitionService  # noqa: E402
+from tests.helpers import async_return  # noqa: E402
+
+_FAKE_IMG_B64 = base64.b64encode(b"fake_image_data").decode("utf-8")
+_FAKE_B64 = base64.b64encode(b"fake").decode("utf-8")
+
+# Shared by the recognition fixture; the handler only reads it
+_RESULT = RecognitionResult(
+    board=[[0] * 19 for _ in range(19)],
+    sgf="(;GM[1]FF[4]SZ[19])",
+    corners=[[50, 50], [350, 50], [350, 350], [50, 350]],
+    warped_base64="fake_base64",
+)
 
 
 @pytest.fixture
 def mock_katago_service():
     """Mock KataGo service."""
-    with patch("serverless.handler.katago_service") as mock:
+    spec = create_autospec(KataGoService, instance=True)
+    with patch.object(_h, "katago_service", spec) as mock:
         mock.is_running.return_value = True
-        mock.analyze = AsyncMock(return_value="(;GM[1]FF[4]SZ[19])")
+        mock.analyze = async_return("(;GM[1]FF[4]SZ[19])")
         yield mock
 
 
 @pytest.fixture
 def mock_recognition_service():
     """Mock recognition service."""
-    with patch("serverless.handler.recognition_service") as mock:
+    spec = create_autospec(RecognitionService, instance=True)
+    with patch.object(_h, "recognition_service", spec) as mock:
         mock.is_available.return_value = True
-        result = RecognitionResult(
-            board=[[0] * 19 for _ in range(19)],
-            sgf="(;GM[1]FF[4]SZ[19])",
-            corners=[[50, 50], [350, 50], [350, 350], [50, 350]],
-            warped_base64="fake_base64",
-        )
-        mock.classify_from_corners = AsyncMock(return_value=result)
-        mock.full_recognition = AsyncMock(return_value=result)
-        mock.initialize = AsyncMock()
+        mock.classify_from_corners = async_return(_RESULT)
+        mock.full_recognition = async_return(_RESULT)
+        mock.initialize = async_return()
         yield mock
 
 
-def test_validate_api_key_no_key_required():
-    """Test API key validation when no key is required."""
-    with patch("serverless.handler.KATAGO_API_KEY", None):
-        assert validate_api_key({}, {}) is True
-
-
-def test_validate_api_key_valid_header():
-    """Test API key validation with valid header."""
-    with patch("serverless.handler.KATAGO_API_KEY", "test-key"):
-        headers = {"X-Worker-Key": "test-key"}
-        assert validate_api_key({}, headers) is True
-
-
-def test_validate_api_key_valid_header_lowercase():
-    """Test API key validation with lowercase header."""
-    with patch("serverless.handler.KATAGO_API_KEY", "test-key"):
-        headers = {"x-worker-key": "test-key"}
-        assert validate_api_key({}, headers) is True
-
-
-def test_validate_api_key_invalid_header():
-    """Test API key validation with invalid header."""
-    with patch("serverless.handler.KATAGO_API_KEY", "test-key"):
-        headers = {"X-Worker-Key": "wrong-key"}
-        assert validate_api_key({}, headers) is False
+@pytest.fixture
+def valid_api_key(monkeypatch):
+    """Let every job past the API key check."""
+    monkeypatch.setattr(_h, "validate_api_key", lambda *_: True)
+
+
+@pytest.mark.parametrize(
+    "api_key,headers,body,expected",
+    [
+        (None, {}, {}, True),  # no key required
+        ("test-key", {"X-Worker-Key": "test-key"}, {}, True),
+        ("test-key", {"x-worker-key": "test-key"}, {}, True),  # lowercase header
+        ("test-key", {"X-Worker-Key": "wrong-key"}, {}, False),
+        ("test-key", {}, {"api_key": "test-key"}, True),  # legacy input body
+        ("test-key", {}, {"api_key": "wrong-key"}, False),
+        ("test-key", {}, {}, False),  # required but not provided
+    ],
+)
+def test_validate_api_key(api_key, headers, body, expected, monkeypatch):
+    """Test API key validation across header and input body sources."""
+    monkeypatch.setattr(_h, "KATAGO_API_KEY", api_key)
+    assert validate_api_key(body, headers) is expected
 
 
-def test_validate_api_key_valid_input_body():
-    """Test API key validation from input body (legacy)."""
-    with (
-        patch("serverless.handler.KATAGO_API_KEY", "test-key"),
-        patch("serverless.handler.logger") as mock_logger,
-    ):
-        job_input = {"api_key": "test-key"}
-        assert validate_api_key(job_input, {}) is True
-        # Should log warning about using body
+def test_validate_api_key_input_body_logs_warning(monkeypatch):
+    """Test that a key passed in the input body (legacy) logs a warning."""
+    monkeypatch.setattr(_h, "KATAGO_API_KEY", "test-key")
+    with patch.object(_h, "logger") as mock_logger:
+        assert validate_api_key({"api_key": "test-key"}, {}) is True
         mock_logger.warning.assert_called_once()
 
 
-def test_validate_api_key_invalid_input_body():
-    """Test API key validation with invalid input body key."""
-    with patch("serverless.handler.KATAGO_API_KEY", "test-key"):
-        job_input = {"api_key": "wrong-key"}
-        assert validate_api_key(job_input, {}) is False
-
-
-def test_validate_api_key_no_key_provided():
-    """Test API key validation when key is required but not provided."""
-    with patch("serverless.handler.KATAGO_API_KEY", "test-key"):
-        assert validate_api_key({}, {}) is False
-
-
 def test_error_response():
     """Test error response formatting."""
     result = error_response(400, "Test error")
@@ -108,7 +103,6 @@ def test_error_response():
     assert result["error"]["message"] == "Test error"
 
 
-@pytest.mark.asyncio
 async def test_handle_analyze_success(mock_katago_service):
     """Test successful analysis handling."""
     request = AnalysisRequest(sgf_data="(;GM[1])", steps=1000)
@@ -116,18 +110,17 @@ async def test_handle_analyze_success(mock_katago_service):
     result = await handle_analyze(request)
 
     assert "analyzed_sgf" in result
-    mock_katago_service.analyze.assert_called_once_with(
-        "(;GM[1])", visits=1000, start_turn=None, end_turn=None
-    )
+    assert mock_katago_service.analyze.calls == [
+        (("(;GM[1])",), {"visits": 1000, "start_turn": None, "end_turn": None})
+    ]
 
 
-@pytest.mark.asyncio
 async def test_handle_analyze_sgf_validation_error(mock_katago_service):
     """Test analysis with SGF validation error."""
     from core.sgf.validator import SGFValidationError
 
     request = AnalysisRequest(sgf_data="invalid", steps=1000)
-    mock_katago_service.analyze.side_effect = SGFValidationError("Bad SGF")
+    mock_katago_service.analyze = async_return(raises=SGFValidationError("Bad SGF"))
 
     result = await handle_analyze(request)
 
@@ -136,13 +129,12 @@ async def test_handle_analyze_sgf_validation_error(mock_katago_service):
     assert "Invalid SGF" in result["error"]["message"]
 
 
-@pytest.mark.asyncio
 async def test_handle_analyze_general_exception(mock_katago_service):
     """Test analysis with general exception."""
     request = AnalysisRequest(sgf_data="(;GM[1])", steps=1000)
-    mock_katago_service.analyze.side_effect = Exception("Engine crashed")
+    mock_katago_service.analyze = async_return(raises=Exception("Engine crashed"))
 
-    with patch("serverless.handler.logger") as mock_logger:
+    with patch.object(_h, "logger") as mock_logger:
         result = await handle_analyze(request)
 
         assert "error" in result
@@ -151,7 +143,6 @@ async def test_handle_analyze_general_exception(mock_katago_service):
         mock_logger.error.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_handle_recognize_invalid_base64():
     """Test recognition with invalid base64 image."""
     request = RecognitionRequest(image="not-valid-base64!!!", board_size=19)
@@ -163,42 +154,35 @@ async def test_handle_recognize_invalid_base64():
     assert "Invalid base64 image" in result["error"]["message"]
 
 
-@pytest.mark.asyncio
 async def test_handle_recognize_with_corners(mock_recognition_service):
     """Test recognition with provided corners."""
-    # Valid base64 image
-    image_b64 = base64.b64encode(b"fake_image_data").decode("utf-8")
     corners = [[50, 50], [350, 50], [350, 350], [50, 350]]
-    request = RecognitionRequest(image=image_b64, corners=corners, board_size=19)
+    request = RecognitionRequest(image=_FAKE_IMG_B64, corners=corners, board_size=19)
 
     result = await handle_recognize(request)
 
     assert "board" in result
     assert "sgf" in result
     assert "corners" in result
-    mock_recognition_service.classify_from_corners.assert_called_once()
+    assert len(mock_recognition_service.classify_from_corners.calls) == 1
 
 
-@pytest.mark.asyncio
 async def test_handle_recognize_full_pipeline(mock_recognition_service):
     """Test full recognition pipeline without corners."""
-    image_b64 = base64.b64encode(b"fake_image_data").decode("utf-8")
-    request = RecognitionRequest(image=image_b64, board_size=19)
+    request = RecognitionRequest(image=_FAKE_IMG_B64, board_size=19)
 
     result = await handle_recognize(request)
 
     assert "board" in result
     assert "sgf" in result
-    mock_recognition_service.full_recognition.assert_called_once()
+    assert len(mock_recognition_service.full_recognition.calls) == 1
 
 
-@pytest.mark.asyncio
 async def test_handle_recognize_detection_failed(mock_recognition_service):
     """Test recognition when detection fails."""
-    image_b64 = base64.b64encode(b"fake_image_data").decode("utf-8")
-    request = RecognitionRequest(image=image_b64, board_size=19)
+    request = RecognitionRequest(image=_FAKE_IMG_B64, board_size=19)
 
-    mock_recognition_service.full_recognition.return_value = None
+    mock_recognition_service.full_recognition = async_return(None)
 
     result = await handle_recognize(request)
 
@@ -207,17 +191,15 @@ async def test_handle_recognize_detection_failed(mock_recognition_service):
     assert "Board detection failed" in result["error"]["message"]
 
 
-@pytest.mark.asyncio
 async def test_handle_recognize_general_exception(mock_recognition_service):
     """Test recognition with general exception."""
-    image_b64 = base64.b64encode(b"fake_image_data").decode("utf-8")
-    request = RecognitionRequest(image=image_b64, board_size=19)
+    request = RecognitionRequest(image=_FAKE_IMG_B64, board_size=19)
 
-    mock_recognition_service.full_recognition.side_effect = Exception(
-        "Recognition error"
+    mock_recognition_service.full_recognition = async_return(
+        raises=Exception("Recognition error")
     )
 
-    with patch("serverless.handler.logger") as mock_logger:
+    with patch.object(_h, "logger") as mock_logger:
         result = await handle_recognize(request)
 
         assert "error" in result
@@ -228,7 +210,7 @@ async def test_handle_recognize_general_exception(mock_recognition_service):
 
 def test_handler_invalid_api_key():
     """Test handler with invalid API key."""
-    with patch("serverless.handler.validate_api_key", return_value=False):
+    with patch.object(_h, "validate_api_key", return_value=False):
         job = {"input": {}, "headers": {}}
         result = handler(job)
 
@@ -236,37 +218,32 @@ def test_handler_invalid_api_key():
         assert result["error"]["code"] == 401
 
 
-def test_handler_analyze_action(mock_katago_service):
+def test_handler_analyze_action(valid_api_key, mock_katago_service):
     """Test handler with analyze action."""
-    with patch("serverless.handler.validate_api_key", return_value=True):
-        job = {
-            "input": {"action": "analyze", "sgf_data": "(;GM[1])", "steps": 1000},
-            "headers": {},
-        }
-        result = handler(job)
+    job = {
+        "input": {"action": "analyze", "sgf_data": "(;GM[1])", "steps": 1000},
+        "headers": {},
+    }
+    result = handler(job)
 
-        assert "analyzed_sgf" in result or "error" in result
+    assert "analyzed_sgf" in result or "error" in result
 
 
-def test_handler_analyze_validation_error():
+def test_handler_analyze_validation_error(valid_api_key):
     """Test handler with invalid analysis request."""
-    with patch("serverless.handler.validate_api_key", return_value=True):
-        job = {
-            "input": {"action": "analyze"},  # Missing sgf_data
-            "headers": {},
-        }
-        result = handler(job)
+    job = {
+        "input": {"action": "analyze"},  # Missing sgf_data
+        "headers": {},
+    }
+    result = handler(job)
 
-        assert "error" in result
-        assert result["error"]["code"] == 422
+    assert "error" in result
+    assert result["error"]["code"] == 422
 
 
-def test_handler_analyze_service_not_running():
+def test_handler_analyze_service_not_running(valid_api_key):
     """Test handler when analysis service is not running."""
-    with (
-        patch("serverless.handler.validate_api_key", return_value=True),
-        patch("serverless.handler.katago_service") as mock_service,
-    ):
+    with patch.object(_h, "katago_service") as mock_service:
         mock_service.is_running.return_value = False
 
         job = {"input": {"action": "analyze", "sgf_data": "(;GM[1])"}, "headers": {}}
@@ -277,39 +254,32 @@ def test_handler_analyze_service_not_running():
         assert "not running" in result["error"]["message"]
 
 
-def test_handler_recognize_action(mock_recognition_service):
+def test_handler_recognize_action(valid_api_key, mock_recognition_service):
     """Test handler with recognize action."""
-    with patch("serverless.handler.validate_api_key", return_value=True):
-        image_b64 = base64.b64encode(b"fake").decode("utf-8")
-        job = {"input": {"action": "recognize", "image": image_b64}, "headers": {}}
-        result = handler(job)
+    job = {"input": {"action": "recognize", "image": _FAKE_B64}, "headers": {}}
+    result = handler(job)
 
-        assert "board" in result or "error" in result
+    assert "board" in result or "error" in result
 
 
-def test_handler_recognize_validation_error():
+def test_handler_recognize_validation_error(valid_api_key):
     """Test handler with invalid recognition request."""
-    with patch("serverless.handler.validate_api_key", return_value=True):
-        job = {
-            "input": {"action": "recognize"},  # Missing image
-            "headers": {},
-        }
-        result = handler(job)
+    job = {
+        "input": {"action": "recognize"},  # Missing image
+        "headers": {},
+    }
+    result = handler(job)
 
-        assert "error" in result
-        assert result["error"]["code"] == 422
+    assert "error" in result
+    assert result["error"]["code"] == 422
 
 
-def test_handler_recognize_service_not_available():
+def test_handler_recognize_service_not_available(valid_api_key):
     """Test handler when recognition service is not available."""
-    with (
-        patch("serverless.handler.validate_api_key", return_value=True),
-        patch("serverless.handler.recognition_service") as mock_service,
-    ):
+    with patch.object(_h, "recognition_service") as mock_service:
         mock_service.is_available.return_value = False
 
-        image_b64 = base64.b64encode(b"fake").decode("utf-8")
-        job = {"input": {"action": "recognize", "image": image_b64}, "headers": {}}
+        job = {"input": {"action": "recognize", "image": _FAKE_B64}, "headers": {}}
         result = handler(job)
 
         assert "error" in result
@@ -317,43 +287,40 @@ def test_handler_recognize_service_not_available():
         assert "not available" in result["error"]["message"]
 
 
-def test_handler_unknown_action():
+def test_handler_unknown_action(valid_api_key):
     """Test handler with unknown action."""
-    with patch("serverless.handler.validate_api_key", return_value=True):
-        job = {"input": {"action": "unknown_action"}, "headers": {}}
-        result = handler(job)
+    job = {"input": {"action": "unknown_action"}, "headers": {}}
+    result = handler(job)
 
-        assert "error" in result
-        assert result["error"]["code"] == 400
-        assert "Unknown action" in result["error"]["message"]
+    assert "error" in result
+    assert result["error"]["code"] == 400
+    assert "Unknown action" in result["error"]["message"]
 
 
-def test_handler_default_action_analyze(mock_katago_service):
+def test_handler_default_action_analyze(valid_api_key, mock_katago_service):
     """Test handler defaults to analyze action."""
-    with patch("serverless.handler.validate_api_key", return_value=True):
-        job = {
-            "input": {"sgf_data": "(;GM[1])"},  # No action specified
-            "headers": {},
-        }
-        result = handler(job)
+    job = {
+        "input": {"sgf_data": "(;GM[1])"},  # No action specified
+        "headers": {},
+    }
+    result = handler(job)
 
-        # Should use analyze as default
-        assert "analyzed_sgf" in result or "error" in result
+    # Should use analyze as default
+    assert "analyzed_sgf" in result or "error" in result
 
 
-@pytest.mark.asyncio
 async def test_initialize():
     """Test service initialization."""
     with (
-        patch("serverless.handler.katago_service") as mock_katago,
-        patch("serverless.handler.recognition_service") as mock_rec,
-        patch("serverless.handler.logger") as mock_logger,
+        patch.object(_h, "katago_service") as mock_katago,
+        patch.object(_h, "recognition_service") as mock_rec,
+        patch.object(_h, "logger") as mock_logger,
     ):
-        mock_katago.start = AsyncMock()
-        mock_rec.initialize = AsyncMock()
+        mock_katago.start = async_return()
+        mock_rec.initialize = async_return()
 
         await initialize()
 
-        mock_katago.start.assert_called_once()
-        mock_rec.initialize.assert_called_once()
+        assert len(mock_katago.start.calls) == 1
+        assert len(mock_rec.initialize.calls) == 1
         mock_logger.info.assert_called_once()
@@ -1,7 +1,12 @@
+import sys
+
 import pytest
 from core.sgf.parser import SGF, SGFNode, Move
 
 
+_LONG_SGF = f"(;GM[1]C[{'A' * 5000}])"
+
+
 # Additional Move class tests
 def test_move_from_gtp_pass():
     """Test Move.from_gtp with pass move."""
@@ -141,29 +146,18 @@ def test_sgf_handicap_stones():
     assert len(placements) >= 4
 
 
-def test_sgf_board_size_property():
-    """Test board_size property for various sizes."""
-    # 19x19
-    sgf19 = "(;GM[1]SZ[19])"
-    root19 = SGF.parse_sgf(sgf19)
-    assert root19.board_size == (19, 19)
-
-    # 13x13
-    sgf13 = "(;GM[1]SZ[13])"
-    root13 = SGF.parse_sgf(sgf13)
-    assert root13.board_size == (13, 13)
-
-    # 9x9
-    sgf9 = "(;GM[1]SZ[9])"
-    root9 = SGF.parse_sgf(sgf9)
-    assert root9.board_size == (9, 9)
-
-
-def test_sgf_non_square_board():
-    """Test non-square board size like 19:13."""
-    sgf = "(;GM[1]SZ[19:13])"
-    root = SGF.parse_sgf(sgf)
-    assert root.board_size == (19, 13)
+@pytest.mark.parametrize(
+    "sgf,expected",
+    [
+        ("(;GM[1]SZ[19])", (19, 19)),
+        ("(;GM[1]SZ[13])", (13, 13)),
+        ("(;GM[1]SZ[9])", (9, 9)),
+        ("(;GM[1]SZ[19:13])", (19, 13)),  # non-square
+    ],
+)
+def test_sgf_board_size_property(sgf, expected):
+    """Test board_size property for various sizes, including non-square."""
+    assert SGF.parse_sgf(sgf).board_size == expected
 
 
 def test_sgf_komi_negative():
@@ -173,17 +167,16 @@ def test_sgf_komi_negative():
     assert root.komi == -5.5
 
 
-def test_sgf_result_various():
+@pytest.mark.parametrize(
+    "sgf,winner",
+    [
+        ("(;GM[1]RE[B+R])", "B+"),  # Black wins by resignation
+        ("(;GM[1]RE[W+2.5])", "W+"),  # White wins by 2.5
+    ],
+)
+def test_sgf_result_various(sgf, winner):
     """Test various result formats."""
-    # Black wins by resignation
-    sgf1 = "(;GM[1]RE[B+R])"
-    root1 = SGF.parse_sgf(sgf1)
-    assert "B+" in root1.get_property("RE", "")
-
-    # White wins by 2.5
-    sgf2 = "(;GM[1]RE[W+2.5])"
-    root2 = SGF.parse_sgf(sgf2)
-    assert "W+" in root2.get_property("RE", "")
+    assert winner in SGF.parse_sgf(sgf).get_property("RE", "")
 
 
 def test_sgf_player_info():
@@ -214,11 +207,8 @@ def test_sgf_empty_property_value():
 
 def test_sgf_very_long_comment():
     """Test parsing very long comments."""
-    long_text = "A" * 5000
-    sgf = f"(;GM[1]C[{long_text}])"
-    root = SGF.parse_sgf(sgf)
-    comment = root.get_property("C")
-    assert len(comment) >= 5000
+    root = SGF.parse_sgf(_LONG_SGF)
+    assert len(root.get_property("C")) >= 5000
 
 
 def test_sgf_special_characters_in_text():
@@ -244,12 +234,10 @@ def test_sgf_deep_variation():
     sgf = "(;GM[1];B[dd](;W[dp](;B[pp](;W[pd]))))"
     root = SGF.parse_sgf(sgf)
 
-    # Navigate deep
-    node = root.children[0]  # B[dd]
-    assert node.move.gtp() == "D16"
-
-    node = node.children[0]  # W[dp]
-    assert node.move.gtp() == "D4"
+    first = root.children[0]  # B[dd]
+    second = first.children[0]  # W[dp]
+    assert first.move.gtp() == "D16"
+    assert second.move.gtp() == "D4"
 
 
 def test_sgf_multiple_variations_at_same_node():
@@ -268,3 +256,16 @@ def test_sgf_node_count():
 
     # Should have root + 4 moves = 5 nodes
     assert len(root.nodes_in_tree) >= 5
+
+
+def test_sgf_nesting_deeper_than_recursion_limit():
+    """Test parsing and serializing variations nested past the recursion limit."""
+    depth = sys.getrecursionlimit() + 100
+    sgf = "(;GM[1]" + "(;B[dd]" * depth + ")" * depth + ")"
+    root = SGF.parse_sgf(sgf)
+
+    nodes = root.nodes_in_tree
+    assert len(nodes) == depth + 1
+    assert nodes[-1].depth == depth
+    assert nodes[-1].root is root
+    assert root.sgf().count("B[dd]") == depth
@@ -23,6 +23,30 @@ class TestSGFParserAdvanced(unittest.TestCase):
             root = SGF.parse_file("game.sgf")
             self.assertEqual(root.get_property("SZ"), "19")
 
+    def test_parse_file_sgf_utf8_skips_chardet(self):
+        """Test that valid UTF-8 without CA is decoded without chardet."""
+        mock_content = "(;GM[1]SZ[19];B[aa]C[Übung])".encode("utf-8")
+        with patch("builtins.open", mock_open(read_data=mock_content)):
+            with patch("chardet.detect") as mock_detect:
+                root = SGF.parse_file("game.sgf")
+                mock_detect.assert_not_called()
+                self.assertEqual(root.children[0].get_property("C"), "Übung")
+
+    def test_parse_file_sgf_bom(self):
+        """Test that a UTF-8 BOM is honored and stripped."""
+        mock_content = b"\xef\xbb\xbf(;GM[1]SZ[13];B[aa])"
+        with patch("builtins.open", mock_open(read_data=mock_content)):
+            root = SGF.parse_file("game.sgf")
+            self.assertEqual(root.get_property("SZ"), "13")
+
+    def test_parse_file_sgf_falls_back_to_chardet(self):
+        """Test that non-UTF-8 content without CA still goes through chardet."""
+        mock_content = "(;GM[1]SZ[19];B[aa]C[棋])".encode("gbk")
+        with patch("builtins.open", mock_open(read_data=mock_content)):
+            with patch("chardet.detect", return_value={"encoding": "GB2312"}):
+                root = SGF.parse_file("game.sgf")
+                self.assertEqual(root.children[0].get_property("C"), "棋")
+
     def test_parse_file_gib(self):
         """Test parsing a GIB file."""
         mock_content = b"\\[GAMEBLACKNAME=BlackPlayer(7d)\\]\n\\[GAMEWHITENAME=WhitePlayer(8d)\\]\nINIB 1 1 0 0\nSTO 0 0 1 10 10"
@@ -40,6 +64,14 @@ class TestSGFParserAdvanced(unittest.TestCase):
         placements = root.placements
         self.assertEqual(len(placements), 3)
 
+    def test_compressed_point_list_clipped_to_board(self):
+        """Test that a rectangle reaching past the board edge is clipped."""
+        root = SGF.parse_sgf("(;GM[1]SZ[9]AB[aa:zz]AW[ii])")
+
+        players = [m.player for m in root.placements]
+        self.assertEqual(players.count("B"), 81)
+        self.assertEqual(players.count("W"), 1)
+
     def test_parse_file_ngf(self):
         """Test parsing an NGF file."""
         # Line 11+ must contain moves like "PM  B  BB"
@@ -104,6 +136,17 @@ class TestSGFParserAdvanced(unittest.TestCase):
         self.assertTrue(pass_move.is_pass)
         self.assertEqual(pass_move.gtp(), "pass")
 
+    def test_move_coordinate_caches_are_bounded(self):
+        """Test that SZ-derived coordinates cannot grow the memo caches without limit."""
+        for height in range(1000, 1200):
+            Move(coords=(0, height - 1), player="B").sgf((19, height))
+            Move(coords=(0, height - 1), player="B").gtp()
+
+        for cached in (Move._gtp_coords, Move._sgf_coords):
+            info = cached.cache_info()
+            self.assertIsNotNone(info.maxsize)
+            self.assertLessEqual(info.currsize, info.maxsize)
+
 
 if __name__ == "__main__":
     unittest.main()
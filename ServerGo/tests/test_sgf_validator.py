@@ -3,6 +3,9 @@ Tests for SGF validator
 """
 
 import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from core.sgf import validator
 from core.sgf.validator import validate_sgf, SGFValidationError, SGFValidator
 
 
@@ -58,6 +61,14 @@ class TestSGFValidator:
         with pytest.raises(SGFValidationError, match="suspicious"):
             validate_sgf(sgf)
 
+    @pytest.mark.parametrize(
+        "comment", ["JavaScript:void(0)", "\u00e9t\u00e9 <SCRIPT>alert(1)"]
+    )
+    def test_suspicious_patterns_ignore_case(self, comment):
+        """Test that pattern matching is case-insensitive for ASCII and Unicode content."""
+        with pytest.raises(SGFValidationError, match="suspicious"):
+            validate_sgf(f"(;GM[1]C[{comment}])")
+
     def test_path_traversal_blocked(self):
         """Test that path traversal is blocked."""
         sgf = "(;GM[1]C[../../etc/passwd])"
@@ -91,3 +102,44 @@ class TestSGFValidator:
         sgf = "(;GM[1](;B[pd];W[dp])(;B[dd];W[pp]))"
         result = validate_sgf(sgf)
         assert result == sgf
+
+    def test_repeated_content_uses_cached_verdict(self):
+        """Test that revalidating identical content skips the validator."""
+        validate_sgf.cache_clear()
+        valid = "(;GM[1]FF[4]SZ[19];B[pd])"
+        invalid = "(;GM[1]C[<script>])"
+
+        assert validate_sgf(valid) == valid
+        with pytest.raises(SGFValidationError, match="suspicious"):
+            validate_sgf(invalid)
+
+        with patch.object(SGFValidator, "validate") as mock_validate:
+            assert validate_sgf(valid) == valid
+            with pytest.raises(SGFValidationError, match="suspicious"):
+                validate_sgf(invalid)
+
+        mock_validate.assert_not_called()
+
+    def test_changed_limits_bypass_cached_verdict(self):
+        """Test that a verdict cached under one set of limits is not reused under another."""
+        validate_sgf.cache_clear()
+        sgf = "(;GM[1]" + ";B[aa]" * 20 + ")"
+        assert validate_sgf(sgf) == sgf
+
+        with patch.object(SGFValidator, "MAX_MOVES", 10):
+            with pytest.raises(SGFValidationError, match="Too many moves"):
+                validate_sgf(sgf)
+
+        assert validate_sgf(sgf) == sgf
+
+    def test_concurrent_eviction(self):
+        """Test that threads evicting from a full cache do not race."""
+        validate_sgf.cache_clear()
+        sgfs = [f"(;GM[1]C[game {i}])" for i in range(400)]
+
+        with patch.object(validator, "_VALIDATE_CACHE_SIZE", 8):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(validate_sgf, sgfs * 4))
+
+        assert results == sgfs * 4
+        assert len(validator._validate_cache) <= 8
@@ -236,3 +236,56 @@ def test_board_to_sgf_partial_board():
 
     assert "AB[aa]" in sgf
     assert "SZ[19]" in sgf
+
+
+def test_classify_board_batched_matches_per_cell():
+    """Test the vectorized board path agrees with classify_cell."""
+    classifier = StoneClassifier()
+    rng = np.random.default_rng(0)
+
+    cells = []
+    for row in range(4):
+        row_cells = []
+        for col in range(4):
+            if (row + col) % 3 == 0:
+                cell = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
+            elif (row + col) % 3 == 1:
+                cell = np.full((32, 32, 3), 180, dtype=np.uint8)
+                cell[::2] = 10  # Striped: board-range mean with high variance
+            else:
+                cell = np.full((32, 32, 3), 20 * (row + col), dtype=np.uint8)
+            row_cells.append(cell)
+        cells.append(row_cells)
+
+    expected = [[int(classifier.classify_cell(cell)) for cell in row] for row in cells]
+
+    assert classifier.classify_board(cells) == expected
+
+
+def test_classify_board_mixed_shapes_falls_back():
+    """Test boards with differently sized cells still classify per cell."""
+    classifier = StoneClassifier()
+    black = np.full((32, 32, 3), 20, dtype=np.uint8)
+    white = np.full((40, 40, 3), 240, dtype=np.uint8)
+
+    board = classifier.classify_board([[black, white]])
+
+    assert board == [[StoneColor.BLACK, StoneColor.WHITE]]
+
+
+def test_classify_boards_preserves_order():
+    """Test concurrent multi-board classification matches classify_board per board."""
+    classifier = StoneClassifier()
+    black = np.full((32, 32, 3), 20, dtype=np.uint8)
+    white = np.full((32, 32, 3), 240, dtype=np.uint8)
+    empty = np.full((32, 32, 3), 180, dtype=np.uint8)
+    boards = [
+        [[black, white], [empty, black]],
+        [[white, white], [white, empty]],
+        [[empty, empty], [black, black]],
+    ]
+
+    result = classifier.classify_boards(boards, max_workers=2)
+
+    assert result == [classifier.classify_board(cells) for cells in boards]
+    assert classifier.classify_boards([]) == []
@@ -5,16 +5,19 @@ Tests the backend SSE endpoint and kata_engine streaming generator.
 
 import unittest
 from unittest.mock import MagicMock
-import json
+import orjson
 import pytest
 
 pytest.importorskip("fastapi", reason="FastAPI not installed")
-from fastapi.testclient import TestClient  # noqa: E402
 
 
 class TestStreamingEndpoint(unittest.TestCase):
     """Test the /analyze/stream SSE endpoint."""
 
+    @pytest.fixture(autouse=True)
+    def _use_shared_client(self, test_client):
+        self.client = test_client
+
     def test_endpoint_registered(self):
         """Verify endpoint is registered in the app."""
         # Functional test is enough, skipping brittle route list check
@@ -52,8 +55,7 @@ class TestStreamingEndpoint(unittest.TestCase):
         app.dependency_overrides[get_katago_service] = lambda: mock_service
 
         try:
-            client = TestClient(app)
-            response = client.post(
+            response = self.client.post(
                 "/v1/analyses/stream",
                 json={"sgf": "(;GM[1]SZ[19];B[pd])", "visits": 100},
             )
@@ -82,8 +84,8 @@ class TestStreamingEventFormat(unittest.TestCase):
         }
 
         # Should be valid JSON
-        json_str = json.dumps(event_data)
-        parsed = json.loads(json_str)
+        payload = orjson.dumps(event_data)
+        parsed = orjson.loads(payload)
 
         self.assertEqual(parsed["turn"], 5)
         self.assertEqual(parsed["total"], 50)
@@ -93,16 +95,27 @@ class TestStreamingEventFormat(unittest.TestCase):
     def test_completion_event(self):
         """Test completion event structure."""
         done_event = {"done": True}
-        json_str = json.dumps(done_event)
-        parsed = json.loads(json_str)
+        payload = orjson.dumps(done_event)
+        parsed = orjson.loads(payload)
 
         self.assertTrue(parsed["done"])
 
+    def test_sse_frame_is_bytes(self):
+        """Test that events are framed as bytes so Starlette sends them unencoded."""
+        from routers.v1.analyses import _sse_event
+
+        frame = _sse_event({"turn": 1, "winrate": 50.0})
+
+        self.assertIsInstance(frame, bytes)
+        self.assertTrue(frame.startswith(b"data: "))
+        self.assertTrue(frame.endswith(b"\n\n"))
+        self.assertEqual(orjson.loads(frame[6:-2]), {"turn": 1, "winrate": 50.0})
+
     def test_error_event(self):
         """Test error event structure."""
         error_event = {"error": "Analysis failed"}
-        json_str = json.dumps(error_event)
-        parsed = json.loads(json_str)
+        payload = orjson.dumps(error_event)
+        parsed = orjson.loads(payload)
 
         self.assertEqual(parsed["error"], "Analysis failed")
 
@@ -110,6 +123,10 @@ class TestStreamingEventFormat(unittest.TestCase):
 class TestStreamingValidation(unittest.TestCase):
     """Test input validation for streaming endpoint."""
 
+    @pytest.fixture(autouse=True)
+    def _use_shared_client(self, test_client):
+        self.client = test_client
+
     def test_steps_parameter_too_low(self):
         """Test that steps parameter under minimum is rejected."""
         from main import app
@@ -118,8 +135,7 @@ class TestStreamingValidation(unittest.TestCase):
         app.dependency_overrides[verify_api_key] = lambda: "test_key"
 
         try:
-            client = TestClient(app)
-            response = client.post(
+            response = self.client.post(
                 "/v1/analyses/stream", json={"sgf": "(;GM[1]SZ[19];B[pd])", "visits": 1}
             )
             self.assertIn(response.status_code, [400, 422])
@@ -133,9 +149,7 @@ class TestStreamingValidation(unittest.TestCase):
         # Clear any overrides
         app.dependency_overrides.clear()
 
-        # Patch the singleton instance attributes
-        client = TestClient(app)
-        response = client.post(
+        response = self.client.post(
             "/v1/analyses/stream", json={"sgf": "(;GM[1]SZ[19];B[pd])", "visits": 100}
         )
 
@@ -25,22 +25,31 @@ def recognizer_no_models(mock_paths):
         return recognizer
 
 
+@pytest.fixture(scope="module")
+def mocked_models():
+    """Segmentation and classifier mocks shared by the module.
+
+    MagicMock synthesizes child attributes on first access, which dominates
+    recognizer setup; reusing one pair keeps those children across tests.
+    """
+    seg_model = MagicMock()
+    seg_model.classifier = [None, None, None, None, MagicMock()]
+    seg_model.aux_classifier = None
+    return seg_model, MagicMock()
+
+
 @pytest.fixture
-def recognizer_with_models():
+def recognizer_with_models(mocked_models):
     """Create recognizer with mocked models."""
+    seg_model, classifier = mocked_models
+    seg_model.reset_mock()
+    classifier.reset_mock()
     with (
         patch("torch.load"),
         patch("services.universal_go_recognizer.deeplabv3_resnet50") as mock_deeplab,
         patch("services.universal_go_recognizer.ResNet9") as mock_resnet,
     ):
-        # Mock segmentation model
-        seg_model = MagicMock()
-        seg_model.classifier = [None, None, None, None, MagicMock()]
-        seg_model.aux_classifier = None
         mock_deeplab.return_value = seg_model
-
-        # Mock classifier
-        classifier = MagicMock()
         mock_resnet.return_value = classifier
 
         # Make paths exist
@@ -136,6 +145,22 @@ def test_intersect_lines_parallel(recognizer_no_models):
     assert result is None
 
 
+def test_intersect_lines_batch(recognizer_no_models):
+    """Test batched intersections match np.linalg.solve and mark parallel pairs NaN."""
+    rhos1 = np.array([100.0, 100.0, 250.0])
+    thetas1 = np.array([0.0, 0.0, 0.3])
+    rhos2 = np.array([100.0, 200.0, 120.0])
+    thetas2 = np.array([np.pi / 2, 0.0, 1.9])
+
+    result = recognizer_no_models._intersect_lines_batch(rhos1, thetas1, rhos2, thetas2)
+
+    assert result.shape == (3, 2)
+    assert np.allclose(result[0], [100, 100])
+    assert np.all(np.isnan(result[1]))
+    A = np.array([[np.cos(0.3), np.sin(0.3)], [np.cos(1.9), np.sin(1.9)]])
+    assert np.allclose(result[2], np.linalg.solve(A, [250.0, 120.0]))
+
+
 def test_order_corners(recognizer_no_models):
     """Test corner ordering by angle."""
     pts = np.array(
@@ -203,6 +228,48 @@ def test_warp_board_success(recognizer_no_models):
     assert warped.shape == (600, 600, 3)
 
 
+def test_warp_board_matches_warp_perspective_and_caches_maps(recognizer_no_models):
+    """Test remap-based warping equals warpPerspective and reuses maps per pose."""
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, (400, 400, 3), dtype=np.uint8)
+    corners = np.array([[40, 60], [360, 45], [370, 350], [30, 340]], dtype=np.float32)
+    pts2 = np.array([[16, 16], [591, 16], [591, 591], [16, 591]], dtype=np.float32)
+    expected = cv2.warpPerspective(
+        img, cv2.getPerspectiveTransform(corners, pts2), (608, 608)
+    )
+
+    warped = recognizer_no_models._warp_board(img, corners, output_size=608, margin=16)
+    assert np.array_equal(warped, expected)
+    assert (corners.tobytes(), 608, 16) in recognizer_no_models._warp_maps
+
+    recognizer_no_models._warp_board(img, corners, output_size=608, margin=16)
+    assert len(recognizer_no_models._warp_maps) == 1
+
+    recognizer_no_models._warp_board(img, corners, output_size=608, margin=0)
+    assert len(recognizer_no_models._warp_maps) == 2
+
+
+def test_warp_board_cuda_error_falls_back_to_cpu(recognizer_no_models):
+    """Test a failing CUDA warp disables the GPU path and returns the CPU result."""
+    img = np.full((400, 400, 3), 128, dtype=np.uint8)
+    corners = np.array([[50, 50], [350, 50], [350, 350], [50, 350]], dtype=np.float32)
+    expected = recognizer_no_models._warp_board(
+        img, corners, output_size=600, margin=20
+    )
+
+    recognizer_no_models._use_cuda_warp = True
+    with patch.object(
+        UniversalGoRecognizer, "_warp_board_cuda", side_effect=cv2.error("no device")
+    ) as mock_cuda:
+        warped = recognizer_no_models._warp_board(
+            img, corners, output_size=600, margin=20
+        )
+
+    mock_cuda.assert_called_once()
+    assert recognizer_no_models._use_cuda_warp is False
+    assert np.array_equal(warped, expected)
+
+
 def test_warp_board_invalid_corners(recognizer_no_models):
     """Test board warping with invalid corners (returns black image)."""
     img = np.zeros((400, 400, 3), dtype=np.uint8)
@@ -246,6 +313,35 @@ def test_detect_corners_with_model(recognizer_with_models):
         # Should return scaled corners or None
 
 
+def test_detect_corners_reuses_mask_for_identical_frames(recognizer_with_models):
+    """Test repeated identical frames skip segmentation; new frames or models do not."""
+    img = np.zeros((400, 400, 3), dtype=np.uint8)
+    mask = np.zeros((800, 800), dtype=np.uint8)
+    cv2.rectangle(mask, (100, 100), (700, 700), 255, -1)
+
+    with (
+        patch(
+            "services.universal_go_recognizer.predict_mask", return_value=mask
+        ) as mock_predict,
+        patch("services.universal_go_recognizer.cleanup_mask", return_value=mask),
+    ):
+        first = recognizer_with_models.detect_corners(img)
+        second = recognizer_with_models.detect_corners(img.copy())
+        assert mock_predict.call_count == 1
+        assert np.array_equal(first, second)
+
+        img[0, 0] = 255
+        recognizer_with_models.detect_corners(img)
+        assert mock_predict.call_count == 2
+
+        # A different model must not be answered from the old model's masks
+        recognizer_with_models.model = MagicMock()
+        recognizer_with_models.detect_corners(img)
+        assert mock_predict.call_count == 3
+
+    assert not mask.flags.writeable
+
+
 def test_classify_from_corners(recognizer_with_models):
     """Test classification from given corners."""
     img = np.zeros((400, 400, 3), dtype=np.uint8)
@@ -344,3 +440,13 @@ def test_board_to_sgf_with_stones():
     assert "AW[sa]" in sgf
     assert sgf.startswith("(;GM[1]FF[4]SZ[19]")
     assert sgf.endswith(")")
+
+
+def test_board_to_sgf_small_board_order():
+    """Test SGF conversion lists stones row by row with column-first coordinates."""
+    board = [[0] * 9 for _ in range(9)]
+    board[2][1] = 1
+    board[0][3] = 1
+    board[8][8] = 2
+
+    assert board_to_sgf(board, board_size=9) == "(;GM[1]FF[4]SZ[9]AB[da][bc]AW[ii])"
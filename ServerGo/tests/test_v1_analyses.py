@@ -3,6 +3,7 @@ import json
 from httpx import AsyncClient, ASGITransport
 from main import app
 from middleware.auth import verify_api_key
+from services.analysis_cache import AnalysisCache, get_analysis_cache
 from services.katago_service import get_katago_service
 from unittest.mock import AsyncMock, MagicMock
 
@@ -10,6 +11,15 @@ from unittest.mock import AsyncMock, MagicMock
 VALID_SGF = "(;GM[1]FF[4]SZ[19];B[pd];W[dp])"
 
 
+@pytest.fixture(scope="module")
+async def client():
+    """One ASGI client for the module instead of one per test."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        yield ac
+
+
 @pytest.fixture(autouse=True)
 def override_auth():
     app.dependency_overrides[verify_api_key] = lambda: "test_key"
@@ -18,8 +28,12 @@ def override_auth():
     mock_service = MagicMock()
     mock_service.analyze = AsyncMock()
     mock_service.analyze.return_value = "(;GM[1]SZ[19]C[Analyzed])"
-    # For streaming
-    mock_service.analyze_stream.return_value = iter([{"turn": 1, "winrate": 0.5}])
+
+    # For streaming: the router consumes analyze_stream with ``async for``
+    async def analyze_stream(*args, **kwargs):
+        yield {"turn": 1, "winrate": 0.5}
+
+    mock_service.analyze_stream = analyze_stream
 
     app.dependency_overrides[get_katago_service] = lambda: mock_service
 
@@ -28,43 +42,52 @@ def override_auth():
     app.dependency_overrides.pop(get_katago_service, None)
 
 
-@pytest.mark.asyncio
-async def test_v1_create_analysis():
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        payload = {"sgf": VALID_SGF, "visits": 100}
-        response = await ac.post("/v1/analyses", json=payload)
+async def test_v1_create_analysis(client):
+    payload = {"sgf": VALID_SGF, "visits": 100}
+    response = await client.post("/v1/analyses", json=payload)
 
-        assert response.status_code == 200
-        data = response.json()
+    assert response.status_code == 200
+    data = response.json()
+
+    # Verify Envelope
+    assert "meta" in data
+    assert data["meta"]["version"] == "v1"
+    assert "data" in data
+    assert "visits_used" in data["data"]
+    # KataGo is mocked usually, so just check structure
 
-        # Verify Envelope
-        assert "meta" in data
-        assert data["meta"]["version"] == "v1"
-        assert "data" in data
-        assert "visits_used" in data["data"]
-        # KataGo is mocked usually, so just check structure
 
+async def test_v1_create_analysis_cache_hit(client, tmp_path):
+    cache = AnalysisCache(str(tmp_path / "cache.sqlite3"))
+    mock_service = MagicMock()
+    mock_service.analyze = AsyncMock(return_value="(;GM[1]SZ[19]C[Analyzed])")
+    app.dependency_overrides[get_katago_service] = lambda: mock_service
+    app.dependency_overrides[get_analysis_cache] = lambda: cache
 
-@pytest.mark.asyncio
-async def test_v1_stream_analysis():
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+    try:
         payload = {"sgf": VALID_SGF, "visits": 100}
-        # SSE request
-        async with ac.stream("POST", "/v1/analyses/stream", json=payload) as response:
-            assert response.status_code == 200
-
-            # Read first event
-            async for line in response.aiter_lines():
-                if line.startswith("data: "):
-                    content = line[6:]
-                    data = json.loads(content)
-                    # Might be error if engine not running test env, or actual data
-                    if "error" in data:
-                        print(
-                            f"Engine error (expected in mockless test): {data['error']}"
-                        )
-                    else:
-                        assert "turn" in data or "done" in data
-                    break
+        first = await client.post("/v1/analyses", json=payload)
+        second = await client.post("/v1/analyses", json=payload)
+    finally:
+        app.dependency_overrides.pop(get_analysis_cache, None)
+        cache.close()
+
+    assert first.headers["X-Analysis-Cache"] == "miss"
+    assert second.headers["X-Analysis-Cache"] == "hit"
+    assert second.json()["data"] == first.json()["data"]
+    mock_service.analyze.assert_awaited_once()
+
+
+async def test_v1_stream_analysis(client):
+    payload = {"sgf": VALID_SGF, "visits": 100}
+    # SSE request
+    async with client.stream("POST", "/v1/analyses/stream", json=payload) as response:
+        assert response.status_code == 200
+
+        # Read first event
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                content = line[6:]
+                data = json.loads(content)
+                assert data == {"turn": 1, "winrate": 0.5}
+                break